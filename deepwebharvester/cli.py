@@ -259,79 +259,85 @@ def main(argv: Optional[List[str]] = None) -> int:
         sqlite_output=cfg.storage.sqlite_output,
     )
 
-    # ── Resume support ────────────────────────────────────────────────────────
-    known_urls = storage.get_known_urls() if args.resume else None
-    if known_urls:
-        logger.info(
-            "Resume mode enabled: %d URL(s) will be skipped.", len(known_urls)
-        )
-
-    # ── Crawl ─────────────────────────────────────────────────────────────────
-    def _on_crawled(result):  # type: ignore[return]
-        logger.debug("Collected [%s]: %s", result.title[:60], result.url)
-
-    crawler = Crawler(
-        tor_manager=tor_manager,
-        extractor=extractor,
-        max_depth=cfg.crawler.max_depth,
-        max_pages=cfg.crawler.max_pages,
-        crawl_delay=cfg.crawler.crawl_delay,
-        request_timeout=cfg.crawler.request_timeout,
-        retry_count=cfg.crawler.retry_count,
-        backoff_factor=cfg.crawler.backoff_factor,
-        renew_circuit_every=cfg.tor.renew_circuit_every,
-        max_workers=cfg.crawler.max_workers,
-        on_page_crawled=_on_crawled,
-    )
-
-    logger.info(
-        "Starting DeepWebHarvester — crawling %d seed URL(s).", len(cfg.seed_urls)
-    )
-
-    results = []
     try:
-        results = crawler.crawl_all(cfg.seed_urls, known_urls)
-    except KeyboardInterrupt:
-        logger.warning("Interrupted by user — saving collected data…")
-
-    # ── Intelligence extraction ───────────────────────────────────────────────
-    intel_data = []
-    intel_stats: dict = {}
-    if results:
-        logger.info("Running intelligence extraction on %d page(s)…", len(results))
-        extractor_intel = IntelligenceExtractor()
-        intel_data = [extractor_intel.analyze(r.url, r.text) for r in results]
+        # ── Resume support ────────────────────────────────────────────────────
+        known_urls = storage.get_known_urls() if args.resume else None
+        if known_urls:
+            logger.info(
+                "Resume mode enabled: %d URL(s) will be skipped.", len(known_urls)
+            )
 
-        total_iocs = sum(p.iocs.total for p in intel_data)
-        high_risk  = sum(
-            1 for p in intel_data if p.threat.risk_label in ("High", "Critical")
+        # ── Crawl ─────────────────────────────────────────────────────────────
+        def _on_crawled(result):  # type: ignore[return]
+            logger.debug("Collected [%s]: %s", result.title[:60], result.url)
+
+        crawler = Crawler(
+            tor_manager=tor_manager,
+            extractor=extractor,
+            max_depth=cfg.crawler.max_depth,
+            max_pages=cfg.crawler.max_pages,
+            crawl_delay=cfg.crawler.crawl_delay,
+            request_timeout=cfg.crawler.request_timeout,
+            retry_count=cfg.crawler.retry_count,
+            backoff_factor=cfg.crawler.backoff_factor,
+            renew_circuit_every=cfg.tor.renew_circuit_every,
+            max_workers=cfg.crawler.max_workers,
+            on_page_crawled=_on_crawled,
         )
-        from collections import Counter
-        cat_counter: Counter = Counter(
-            cat for p in intel_data for cat in p.threat.categories
-        )
-        intel_stats = {
-            "total_iocs":     total_iocs,
-            "high_risk":      high_risk,
-            "cves":           sum(len(p.iocs.cves)          for p in intel_data),
-            "btc":            sum(len(p.iocs.btc_addresses) for p in intel_data),
-            "emails":         sum(len(p.iocs.emails)        for p in intel_data),
-            "top_categories": [cat for cat, _ in cat_counter.most_common(3)],
-        }
+
         logger.info(
-            "Intelligence: %d IOC(s) — %d High/Critical page(s)",
-            total_iocs, high_risk,
+            "Starting DeepWebHarvester — crawling %d seed URL(s).", len(cfg.seed_urls)
         )
 
-    # ── Persist results ───────────────────────────────────────────────────────
-    paths = storage.save_all(results, intel_data or None) if results else {}
+        results = []
+        try:
+            results = crawler.crawl_all(cfg.seed_urls, known_urls)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted by user — saving collected data…")
+
+        # ── Intelligence extraction ───────────────────────────────────────────
+        intel_data = []
+        intel_stats: dict = {}
+        if results:
+            logger.info("Running intelligence extraction on %d page(s)…", len(results))
+            extractor_intel = IntelligenceExtractor()
+            intel_data = extractor_intel.analyze_many(
+                ((r.url, r.text) for r in results), use_pool=True
+            )
+
+            total_iocs = sum(p.iocs.total for p in intel_data)
+            high_risk  = sum(
+                1 for p in intel_data if p.threat.risk_label in ("High", "Critical")
+            )
+            from collections import Counter
+            cat_counter: Counter = Counter(
+                cat for p in intel_data for cat in p.threat.categories
+            )
+            intel_stats = {
+                "total_iocs":     total_iocs,
+                "high_risk":      high_risk,
+                "cves":           sum(len(p.iocs.cves)          for p in intel_data),
+                "btc":            sum(len(p.iocs.btc_addresses) for p in intel_data),
+                "emails":         sum(len(p.iocs.emails)        for p in intel_data),
+                "top_categories": [cat for cat, _ in cat_counter.most_common(3)],
+            }
+            logger.info(
+                "Intelligence: %d IOC(s) — %d High/Critical page(s)",
+                total_iocs, high_risk,
+            )
+
+        # ── Persist results ───────────────────────────────────────────────────
+        paths = storage.save_all(results, intel_data or None) if results else {}
+    finally:
+        storage.close()
 
     # ── HTML report ───────────────────────────────────────────────────────────
     if results:
         try:
             report_gen = ReportGenerator()
             report_path = report_gen.generate(
-                results, output_dir=cfg.storage.output_dir
+                results, output_dir=cfg.storage.output_dir,
+                intel_data=intel_data or None,
             )
             paths["html"] = report_path
             logger.info("HTML report written → %s", report_path)
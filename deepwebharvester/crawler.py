@@ -16,7 +16,7 @@ import time
 from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import Callable, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from requests import Session
 from requests.exceptions import ConnectionError, RequestException
@@ -33,6 +33,13 @@ logger = logging.getLogger(__name__)
 class CrawlResult:
     """Structured result for a single successfully crawled page."""
 
+    # Explicit slots (no ``slots=True`` before Python 3.10): large crawls keep
+    # thousands of these alive, and none of the fields carry a default.
+    __slots__ = (
+        "content_hash", "crawl_time", "depth", "links_found",
+        "site", "text", "title", "url",
+    )
+
     url: str
     title: str
     text: str
@@ -42,6 +49,19 @@ class CrawlResult:
     links_found: int        # count of valid .onion links extracted
     site: str               # base .onion domain
 
+    def as_dict(self) -> dict:
+        """Return the JSON export record for this page."""
+        return {
+            "url":          self.url,
+            "site":         self.site,
+            "title":        self.title,
+            "depth":        self.depth,
+            "crawl_time_s": round(self.crawl_time, 3),
+            "links_found":  self.links_found,
+            "content_hash": self.content_hash,
+            "text":         self.text,
+        }
+
 
 @dataclass
 class CrawlStats:
@@ -290,8 +310,13 @@ class Crawler:
         Returns:
             Combined :class:`CrawlResult` list from all sites.
         """
-        valid_urls = [u for u in seed_urls if self._extractor.is_valid_onion_url(u)]
-        skipped = set(seed_urls) - set(valid_urls)
+        valid_urls: List[str] = []
+        skipped: Dict[str, None] = {}  # insertion-ordered set of rejected seeds
+        for url in seed_urls:
+            if self._extractor.is_valid_onion_url(url):
+                valid_urls.append(url)
+            else:
+                skipped[url] = None
         for url in skipped:
             logger.warning("Invalid or non-.onion URL skipped: %s", url)
 
@@ -16,6 +16,9 @@ from bs4 import BeautifulSoup
 # Tor v3 onion addresses use 56 base32 characters (lower-case a-z, 2-7)
 _ONION_V3_RE = re.compile(r"^https?://[a-z2-7]{56}\.onion(/|$)", re.IGNORECASE)
 
+# Three or more consecutive newlines (collapsed to one blank line)
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
 # Tags whose content should always be discarded
 _NOISE_TAGS = ["script", "style", "noscript", "head", "meta", "link"]
 
@@ -122,7 +125,7 @@ class PageExtractor:
             tag.decompose()
         raw_text = soup.get_text(separator="\n", strip=True)
         # Collapse runs of blank lines to a single blank line
-        text = re.sub(r"\n{3,}", "\n\n", raw_text)
+        text = _BLANK_RUN_RE.sub("\n\n", raw_text)
 
         # ── Content hash ──────────────────────────────────────────────────────
         content_hash = hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
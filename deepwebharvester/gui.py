@@ -24,7 +24,7 @@ import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, scrolledtext, ttk
-from typing import Optional
+from typing import Optional, Union
 
 from . import __version__
 from .config import AppConfig, load_config
@@ -80,7 +80,7 @@ _FONT_SMALL = ("Segoe UI", 9)
 class QueueHandler(logging.Handler):
     """Emit log records into a thread-safe queue for UI consumption."""
 
-    def __init__(self, log_queue: queue.Queue) -> None:
+    def __init__(self, log_queue: Union[queue.Queue, queue.SimpleQueue]) -> None:
         super().__init__()
         self._q = log_queue
 
@@ -917,14 +917,18 @@ class App(tk.Tk):
             f"Workers: {cfg.crawler.max_workers}"
         )
 
+        self._launch_crawl_thread(cfg)
+
+        # Poll for stats updates
+        self.after(500, self._poll_stats)
+
+    def _launch_crawl_thread(self, cfg: AppConfig) -> None:
+        """Start the background crawl thread (the only place one is created)."""
         self._crawl_thread = threading.Thread(
             target=self._crawl_worker, args=(cfg,), daemon=True
         )
         self._crawl_thread.start()
 
-        # Poll for stats updates
-        self.after(500, self._poll_stats)
-
     def _on_stop(self) -> None:
         self._stop_event.set()
         self._status_var.set("Stopping...")
@@ -971,76 +975,84 @@ class App(tk.Tk):
                 sqlite_output=cfg.storage.sqlite_output,
             )
 
-            known_urls = (
-                storage.get_known_urls()
-                if self._resume_var.get()
-                else None
-            )
-            if known_urls:
-                logging.info(
-                    "Resume mode: %d URL(s) will be skipped.", len(known_urls)
+            try:
+                known_urls = (
+                    storage.get_known_urls()
+                    if self._resume_var.get()
+                    else None
                 )
-
-            def _on_page(result: CrawlResult) -> None:
-                self._crawl_results.append(result)
-                logging.debug("  + [%s]  %s", result.title[:50], result.url)
-
-            self._active_crawler = Crawler(
-                tor_manager=tor_manager,
-                extractor=extractor,
-                max_depth=cfg.crawler.max_depth,
-                max_pages=cfg.crawler.max_pages,
-                crawl_delay=cfg.crawler.crawl_delay,
-                request_timeout=cfg.crawler.request_timeout,
-                retry_count=cfg.crawler.retry_count,
-                backoff_factor=cfg.crawler.backoff_factor,
-                renew_circuit_every=cfg.tor.renew_circuit_every,
-                max_workers=cfg.crawler.max_workers,
-                on_page_crawled=_on_page,
-            )
-
-            results = self._active_crawler.crawl_all(cfg.seed_urls, known_urls)
-
-            if self._stop_event.is_set():
-                logging.warning("Crawl stopped by user. Saving %d result(s).", len(results))
-
-            # Intelligence extraction
-            intel_data = []
-            if results:
-                try:
-                    logging.info("Running intelligence extraction on %d page(s)…", len(results))
-                    intel_extractor = IntelligenceExtractor()
-                    intel_data = [intel_extractor.analyze(r.url, r.text) for r in results]
-                    total_iocs = sum(p.iocs.total for p in intel_data)
-                    high_risk  = sum(
-                        1 for p in intel_data
-                        if p.threat.risk_label in ("High", "Critical")
-                    )
-                    from collections import Counter
-                    cat_counter: Counter = Counter(
-                        cat for p in intel_data for cat in p.threat.categories
+                if known_urls:
+                    logging.info(
+                        "Resume mode: %d URL(s) will be skipped.", len(known_urls)
                     )
-                    self._intel_stats = {
-                        "total_iocs":     total_iocs,
-                        "high_risk":      high_risk,
-                        "cves":           sum(len(p.iocs.cves) for p in intel_data),
-                        "btc":            sum(len(p.iocs.btc_addresses) for p in intel_data),
-                        "emails":         sum(len(p.iocs.emails) for p in intel_data),
-                        "top_categories": [cat for cat, _ in cat_counter.most_common(3)],
-                    }
-                    self._intel_data = intel_data
-                    logging.info("Intelligence: %d IOC(s), %d High/Critical", total_iocs, high_risk)
-                except Exception as exc:
-                    logging.warning("Intelligence extraction failed: %s", exc)
 
-            self._result_paths = storage.save_all(results, intel_data or None)
+                def _on_page(result: CrawlResult) -> None:
+                    self._crawl_results.append(result)
+                    logging.debug("  + [%s]  %s", result.title[:50], result.url)
+
+                self._active_crawler = Crawler(
+                    tor_manager=tor_manager,
+                    extractor=extractor,
+                    max_depth=cfg.crawler.max_depth,
+                    max_pages=cfg.crawler.max_pages,
+                    crawl_delay=cfg.crawler.crawl_delay,
+                    request_timeout=cfg.crawler.request_timeout,
+                    retry_count=cfg.crawler.retry_count,
+                    backoff_factor=cfg.crawler.backoff_factor,
+                    renew_circuit_every=cfg.tor.renew_circuit_every,
+                    max_workers=cfg.crawler.max_workers,
+                    on_page_crawled=_on_page,
+                )
+
+                results = self._active_crawler.crawl_all(cfg.seed_urls, known_urls)
+
+                if self._stop_event.is_set():
+                    logging.warning("Crawl stopped by user. Saving %d result(s).", len(results))
+
+                # Intelligence extraction
+                intel_data = []
+                if results:
+                    try:
+                        logging.info("Running intelligence extraction on %d page(s)…", len(results))
+                        intel_extractor = IntelligenceExtractor()
+                        intel_data = intel_extractor.analyze_many(
+                            ((r.url, r.text) for r in results), use_pool=True
+                        )
+                        total_iocs = sum(p.iocs.total for p in intel_data)
+                        high_risk  = sum(
+                            1 for p in intel_data
+                            if p.threat.risk_label in ("High", "Critical")
+                        )
+                        from collections import Counter
+                        cat_counter: Counter = Counter(
+                            cat for p in intel_data for cat in p.threat.categories
+                        )
+                        self._intel_stats = {
+                            "total_iocs":     total_iocs,
+                            "high_risk":      high_risk,
+                            "cves":           sum(len(p.iocs.cves) for p in intel_data),
+                            "btc":            sum(len(p.iocs.btc_addresses) for p in intel_data),
+                            "emails":         sum(len(p.iocs.emails) for p in intel_data),
+                            "top_categories": [cat for cat, _ in cat_counter.most_common(3)],
+                        }
+                        self._intel_data = intel_data
+                        logging.info(
+                            "Intelligence: %d IOC(s), %d High/Critical", total_iocs, high_risk
+                        )
+                    except Exception as exc:
+                        logging.warning("Intelligence extraction failed: %s", exc)
+
+                self._result_paths = storage.save_all(results, intel_data or None)
+            finally:
+                storage.close()
 
             # HTML report
             if results:
                 try:
                     report_gen = ReportGenerator()
                     report_path = report_gen.generate(
-                        results, output_dir=cfg.storage.output_dir
+                        results, output_dir=cfg.storage.output_dir,
+                        intel_data=intel_data or None,
                     )
                     self._result_paths["html"] = report_path
                     logging.info("HTML report written → %s", report_path)
@@ -4,7 +4,9 @@ Threat intelligence extraction and content classification.
 Extracts Indicators of Compromise (IOCs) from raw page text and classifies
 content into threat intelligence categories with an automated risk score.
 This module is fully standalone — it has no dependencies on other
-DeepWebHarvester modules and can be used independently.
+DeepWebHarvester modules and can be used independently.  When the optional
+``pyahocorasick`` package is installed, keyword classification runs as a
+single multi-pattern pass over the text.
 
 Typical usage::
 
@@ -12,28 +14,57 @@ Typical usage::
     iocs      = extractor.extract_iocs(page_text)
     threat    = extractor.classify_threat(page_text)
     summary   = extractor.analyze(url, page_text)
+    summaries = extractor.analyze_many([(url, page_text), ...])
 """
 from __future__ import annotations
 
+import logging
+import multiprocessing
+import os
+import pickle
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:  # optional C multi-pattern matcher for classify_threat
+    import ahocorasick
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Process-pool settings (IntelligenceExtractor.analyze_many)
+# ---------------------------------------------------------------------------
+
+# Measured on a 1-CPU host: analysis runs at ~4 MB of text per second
+# in-process, and spawning 1/2/4 workers costs ~0.13/0.17/0.36 s before any
+# work is done.  Below ~2 MB (~0.5 s of work) the pool cannot pay that back.
+_POOL_MIN_CHARS = 2_000_000
+_POOL_CHUNKSIZE = 16
+_NO_POOL_ENV = "DEEPWEBHARVESTER_NO_POOL"
+_FALSE_ENV_VALUES = frozenset({"", "0", "false", "no", "off"})
 
 # ---------------------------------------------------------------------------
 # Compiled IOC patterns
 # ---------------------------------------------------------------------------
 
+# Octet alternatives are ordered 0-199 first: most real octets fall in that
+# range, so the engine rarely has to backtrack out of the 200-255 branches.
 _IPV4_RE = re.compile(
-    r"\b(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}"
-    r"(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b"
+    r"\b(?:(?:[01]?\d\d?|2[0-4]\d|25[0-5])\.){3}"
+    r"(?:[01]?\d\d?|2[0-4]\d|25[0-5])\b"
 )
 _EMAIL_RE = re.compile(
     r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b"
 )
-_MD5_RE    = re.compile(r"\b[0-9a-fA-F]{32}\b")
-_SHA1_RE   = re.compile(r"\b[0-9a-fA-F]{40}\b")
-_SHA256_RE = re.compile(r"\b[0-9a-fA-F]{64}\b")
-_CVE_RE    = re.compile(r"\bCVE-\d{4}-\d{4,7}\b", re.IGNORECASE)
+# MD5 / SHA-1 / SHA-256 — a hex token is exactly one of these, so a single
+# pass over the text finds all three; the match length selects the bucket.
+_HEX_HASH_RE = re.compile(r"\b[0-9a-fA-F]{32,64}\b")
+_HASH_KIND_BY_LEN = {32: "md5", 40: "sha1", 64: "sha256"}
+_CVE_RE    = re.compile(r"\bCVE-(\d{4})-(\d{4,7})\b", re.IGNORECASE)
 # Bitcoin — Legacy (P2PKH/P2SH) and SegWit bech32
 _BTC_RE = re.compile(
     r"\b(?:bc1[ac-hj-np-z02-9]{6,87}"
@@ -43,18 +74,84 @@ _BTC_RE = re.compile(
 _XMR_RE    = re.compile(r"\b4[0-9AB][1-9A-HJ-NP-Za-km-z]{93}\b")
 # Tor v3 onion hostnames (without scheme)
 _ONION_RE  = re.compile(r"\b[a-z2-7]{56}\.onion\b", re.IGNORECASE)
+# v3 onion labels: 56 base32 characters immediately before ".onion"
+_ONION_SUFFIX = ".onion"
+_ONION_LABEL_LEN = 56
+_BASE32_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz234567")
 # Clear-web domains (common TLDs only to reduce noise)
 _DOMAIN_RE = re.compile(
     r"\b(?:[a-z0-9](?:[a-z0-9\-]{0,61}[a-z0-9])?\.)"
     r"+(?:com|net|org|io|ru|cn|de|uk|fr|it|es|gov|edu|mil|co)\b",
     re.IGNORECASE,
 )
-# PGP blocks
-_PGP_RE = re.compile(r"-----BEGIN PGP")
+# PGP blocks (plain substring test, no regex needed)
+_PGP_MARKER = "-----BEGIN PGP"
 # Generic HTTP(S) URLs
 _URL_RE = re.compile(r"https?://[^\s\"'<>]{8,200}", re.IGNORECASE)
-# Private / RFC-1918 prefixes to exclude from IPv4 IOCs
-_PRIVATE_PREFIXES = ("127.", "10.", "192.168.", "169.254.", "::1")
+# Maximum number of distinct URLs kept per page
+_MAX_URLS = 50
+# Private / RFC-1918, loopback and link-local ranges to exclude from IPv4
+# IOCs, as (network, netmask) pairs on the packed 32-bit address
+_PRIVATE_NETS: Tuple[Tuple[int, int], ...] = (
+    (0x0A000000, 0xFF000000),   # 10.0.0.0/8
+    (0xAC100000, 0xFFF00000),   # 172.16.0.0/12
+    (0xC0A80000, 0xFFFF0000),   # 192.168.0.0/16
+    (0x7F000000, 0xFF000000),   # 127.0.0.0/8
+    (0xA9FE0000, 0xFFFF0000),   # 169.254.0.0/16
+)
+
+
+def _is_private_ipv4(ip: str) -> bool:
+    """Return ``True`` if dotted-quad *ip* falls in one of :data:`_PRIVATE_NETS`."""
+    a, b, c, d = ip.split(".")
+    packed = (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+    return any((packed & mask) == net for net, mask in _PRIVATE_NETS)
+
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror the regex ``\\w`` class for the word-boundary checks."""
+    return ch.isalnum() or ch == "_"
+
+
+def _find_onions(text: str, text_lower: str) -> Set[str]:
+    """Return the v3 onion addresses in *text*, as matched by :data:`_ONION_RE`.
+
+    Rather than trying the 56-character pattern at every offset, jump
+    between ``.onion`` occurrences with :meth:`str.find` and check only the
+    label in front of each.  *text_lower* must be ``text.lower()``.
+    """
+    if len(text_lower) != len(text):
+        # Lower-casing changed offsets (e.g. U+0130); use the regex instead
+        return set(_ONION_RE.findall(text))
+    found: Set[str] = set()
+    n = len(text)
+    idx = text_lower.find(_ONION_SUFFIX)
+    while idx != -1:
+        start = idx - _ONION_LABEL_LEN
+        end = idx + len(_ONION_SUFFIX)
+        if (
+            start >= 0
+            and (start == 0 or not _is_word_char(text[start - 1]))
+            and (end == n or not _is_word_char(text[end]))
+            and _BASE32_CHARS.issuperset(text_lower[start:idx])
+        ):
+            found.add(text[start:end])
+        idx = text_lower.find(_ONION_SUFFIX, idx + 1)
+    return found
+
+
+def _first_unique_urls(text: str, limit: int = _MAX_URLS) -> List[str]:
+    """Return the first *limit* distinct URLs in *text*, sorted.
+
+    Scanning stops as soon as the cap is reached, so link-heavy pages are
+    not matched in full only to throw most of the list away.
+    """
+    seen: Dict[str, None] = {}
+    for match in _URL_RE.finditer(text):
+        seen[match.group()] = None
+        if len(seen) >= limit:
+            break
+    return sorted(seen)
 
 
 # ---------------------------------------------------------------------------
@@ -124,6 +221,59 @@ _CATEGORY_RISK: Dict[str, float] = {
     "Cryptocurrency Services":  0.70,
 }
 
+# (category, lower-cased keywords, risk weight) resolved once at import so
+# classify_threat does no per-call lowering or dict lookups.
+_CATEGORY_TABLE: Tuple[Tuple[str, Tuple[str, ...], float], ...] = tuple(
+    (category, tuple(kw.lower() for kw in keywords), _CATEGORY_RISK.get(category, 0.5))
+    for category, keywords in _CATEGORIES.items()
+)
+
+
+def _build_keyword_automaton(
+    table: Tuple[Tuple[str, Tuple[str, ...], float], ...] = _CATEGORY_TABLE,
+) -> Any:
+    """
+    Index every distinct keyword as ``(keyword id, length, category indices)``.
+
+    ``add_word`` replaces the value of a key that is already present, so a
+    keyword listed under several categories (or twice under one) is stored
+    once with all of its owners; otherwise only the last would get its hits.
+    """
+    owners: Dict[str, List[int]] = {}
+    for cat_idx, (_category, keywords, _weight) in enumerate(table):
+        for kw in keywords:
+            owners.setdefault(kw, []).append(cat_idx)
+
+    automaton = ahocorasick.Automaton()
+    for kw_id, (kw, cat_idxs) in enumerate(owners.items()):
+        automaton.add_word(kw, (kw_id, len(kw), tuple(cat_idxs)))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick is not None else None
+
+
+def _count_keyword_hits(text_lower: str) -> List[int]:
+    """
+    Return the number of keyword hits per entry of :data:`_CATEGORY_TABLE`.
+
+    Counts match ``str.count`` semantics: every keyword is counted on its
+    own (``"ransom"`` inside ``"ransomware"`` is a hit for both), but
+    overlapping occurrences of the *same* keyword count once.
+    """
+    if _KEYWORD_AUTOMATON is None:
+        return [sum(map(text_lower.count, keywords)) for _c, keywords, _w in _CATEGORY_TABLE]
+
+    counts = [0] * len(_CATEGORY_TABLE)
+    last_end: Dict[int, int] = {}
+    for end, (kw_id, kw_len, cat_idxs) in _KEYWORD_AUTOMATON.iter(text_lower):
+        if end - kw_len >= last_end.get(kw_id, -1):
+            for cat_idx in cat_idxs:
+                counts[cat_idx] += 1
+            last_end[kw_id] = end
+    return counts
+
 
 # ---------------------------------------------------------------------------
 # Data classes
@@ -240,8 +390,10 @@ class IntelligenceExtractor:
         """
         Extract and deduplicate all IOC types from *text*.
 
-        Private / RFC-1918 IP addresses are excluded from results.
-        The URL list is capped at 50 entries to avoid bloating storage.
+        Private (RFC-1918), loopback and link-local IPv4 addresses are
+        excluded from results.
+        The URL list keeps the first 50 distinct URLs in page order (returned
+        sorted) to avoid bloating storage.
 
         Args:
             text: Raw visible page text.
@@ -249,25 +401,42 @@ class IntelligenceExtractor:
         Returns:
             A populated :class:`IOCs` instance.
         """
+        # Cheap substring tests skip regex passes whose mandatory literal is
+        # absent, which is the common case for most page text.
+        text_lower = text.lower()
+        has_onion = ".onion" in text_lower
+        has_cve = "cve-" in text_lower
+        has_email = "@" in text
+        has_url = "://" in text
+
         ipv4_raw = set(_IPV4_RE.findall(text))
-        ipv4_clean = sorted(
-            ip for ip in ipv4_raw
-            if not any(ip.startswith(p) for p in _PRIVATE_PREFIXES)
+        ipv4_clean = sorted(ip for ip in ipv4_raw if not _is_private_ipv4(ip))
+
+        hashes: Dict[str, Set[str]] = {"md5": set(), "sha1": set(), "sha256": set()}
+        for token in _HEX_HASH_RE.findall(text):
+            kind = _HASH_KIND_BY_LEN.get(len(token))
+            if kind is not None:
+                hashes[kind].add(token)
+
+        # Rebuild the canonical ID from the numeric groups instead of
+        # upper-casing each matched slice.
+        cves = (
+            {f"CVE-{year}-{seq}" for year, seq in _CVE_RE.findall(text)} if has_cve else set()
         )
 
         return IOCs(
             ipv4=ipv4_clean,
-            emails=sorted(set(_EMAIL_RE.findall(text))),
-            md5=sorted(set(_MD5_RE.findall(text))),
-            sha1=sorted(set(_SHA1_RE.findall(text))),
-            sha256=sorted(set(_SHA256_RE.findall(text))),
-            cves=sorted({m.upper() for m in _CVE_RE.findall(text)}),
+            emails=sorted(set(_EMAIL_RE.findall(text))) if has_email else [],
+            md5=sorted(hashes["md5"]),
+            sha1=sorted(hashes["sha1"]),
+            sha256=sorted(hashes["sha256"]),
+            cves=sorted(cves),
             btc_addresses=sorted(set(_BTC_RE.findall(text))),
             xmr_addresses=sorted(set(_XMR_RE.findall(text))),
-            onion_addresses=sorted(set(_ONION_RE.findall(text))),
+            onion_addresses=sorted(_find_onions(text, text_lower)) if has_onion else [],
             domains=sorted(set(_DOMAIN_RE.findall(text))),
-            urls=sorted(set(_URL_RE.findall(text)))[:50],
-            pgp_present=bool(_PGP_RE.search(text)),
+            urls=_first_unique_urls(text) if has_url else [],
+            pgp_present=_PGP_MARKER in text,
         )
 
     # ── Threat classification ─────────────────────────────────────────────────
@@ -300,12 +469,11 @@ class IntelligenceExtractor:
         category_scores: Dict[str, float] = {}
         keyword_hits: Dict[str, int] = {}
 
-        for category, keywords in _CATEGORIES.items():
-            hits = sum(text_lower.count(kw.lower()) for kw in keywords)
+        hit_counts = _count_keyword_hits(text_lower)
+        for (category, _keywords, weight), hits in zip(_CATEGORY_TABLE, hit_counts):
             if hits == 0:
                 continue
             density = min(hits / (word_count / 1000.0), 1.0)
-            weight  = _CATEGORY_RISK.get(category, 0.5)
             category_scores[category] = density * weight * 10.0
             keyword_hits[category] = hits
 
@@ -354,3 +522,83 @@ class IntelligenceExtractor:
             iocs=self.extract_iocs(text),
             threat=self.classify_threat(text),
         )
+
+    def analyze_many(
+        self, pages: Iterable[Tuple[str, str]], use_pool: bool = False
+    ) -> List[PageIntelligence]:
+        """
+        Run :meth:`analyze` over many ``(url, text)`` pairs, preserving order.
+
+        With *use_pool*, batches of at least :data:`_POOL_MIN_CHARS` characters
+        of text are spread over a process pool, since the regex work holds
+        the GIL and does not scale with threads.  The pool uses the ``spawn``
+        start method, so every worker re-imports the caller's ``__main__``:
+        only enable it from a script whose top-level code sits behind an
+        ``if __name__ == "__main__":`` guard.
+
+        Each worker receives a pickled copy of this extractor, so subclasses
+        and configured instances give the same results either way; one that
+        cannot be pickled is run in-process.  Setting the
+        ``DEEPWEBHARVESTER_NO_POOL`` environment variable to ``1``/``true``
+        overrides *use_pool* (e.g. when debugging); ``0``/``false`` or an
+        empty value do not.
+
+        Args:
+            pages:    ``(url, text)`` pairs, typically one per crawl result.
+            use_pool: Allow a process pool for large batches.  Off by default.
+
+        Returns:
+            One :class:`PageIntelligence` per input pair, in input order.
+        """
+        pairs = list(pages)
+        workers = min(os.cpu_count() or 1, -(-len(pairs) // _POOL_CHUNKSIZE))
+        if (
+            not use_pool
+            or sum(len(text) for _url, text in pairs) < _POOL_MIN_CHARS
+            or workers < 2
+            or _pool_disabled()
+        ):
+            return [self.analyze(url, text) for url, text in pairs]
+        try:
+            pickle.dumps(self)
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            logger.warning("Extractor cannot be sent to workers (%s); analysing in-process.", exc)
+            return [self.analyze(url, text) for url, text in pairs]
+        try:
+            # spawn, not fork: callers (GUI, crawler) run other threads
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self,),
+            ) as pool:
+                return list(pool.map(_analyze_pair, pairs, chunksize=_POOL_CHUNKSIZE))
+        except (OSError, BrokenProcessPool) as exc:
+            logger.warning("Process pool unavailable (%s); analysing in-process.", exc)
+            return [self.analyze(url, text) for url, text in pairs]
+
+
+# ---------------------------------------------------------------------------
+# Process-pool workers
+# ---------------------------------------------------------------------------
+
+# Set in each worker process by _init_worker
+_POOL_EXTRACTOR: Optional[IntelligenceExtractor] = None
+
+
+def _pool_disabled() -> bool:
+    """Return True when ``DEEPWEBHARVESTER_NO_POOL`` is set to a true value."""
+    return os.environ.get(_NO_POOL_ENV, "").strip().lower() not in _FALSE_ENV_VALUES
+
+
+def _init_worker(extractor: IntelligenceExtractor) -> None:
+    """Process-pool initializer: keep the caller's extractor for this worker."""
+    global _POOL_EXTRACTOR
+    _POOL_EXTRACTOR = extractor
+
+
+def _analyze_pair(pair: Tuple[str, str]) -> PageIntelligence:
+    """Process-pool entry point; must stay module-level to be picklable."""
+    if _POOL_EXTRACTOR is None:
+        raise RuntimeError("pool worker started without _init_worker")
+    return _POOL_EXTRACTOR.analyze(*pair)
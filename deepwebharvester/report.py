@@ -13,12 +13,13 @@ Usage::
 
     from deepwebharvester.report import ReportGenerator
     gen = ReportGenerator()
-    path = gen.generate(results, intelligence_data, output_dir="results")
+    path = gen.generate(results, output_dir="results", intel_data=intelligence_data)
 """
 from __future__ import annotations
 
 import html
 import json
+import logging
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -27,6 +28,8 @@ from .crawler import CrawlResult
 from .intelligence import IntelligenceExtractor, PageIntelligence
 from .visualizer import GraphVisualizer
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # CSS — embedded, no external dependencies
 # ---------------------------------------------------------------------------
@@ -228,8 +231,18 @@ def _e(text: str) -> str:
     return html.escape(str(text), quote=True)
 
 
+# Badges for the fixed risk labels, rendered once instead of once per row
+_RISK_BADGES: Dict[str, str] = {
+    label: f'<span class="risk risk-{label}">{label}</span>'
+    for label in ("Low", "Medium", "High", "Critical")
+}
+
+
 def _risk_badge(label: str) -> str:
-    return f'<span class="risk risk-{_e(label)}">{_e(label)}</span>'
+    badge = _RISK_BADGES.get(label)
+    if badge is None:
+        badge = f'<span class="risk risk-{_e(label)}">{_e(label)}</span>'
+    return badge
 
 
 def _ioc_pill(kind: str, value: str, css_class: str) -> str:
@@ -268,20 +281,31 @@ class ReportGenerator:
         results: List[CrawlResult],
         output_dir: str = "results",
         filename: Optional[str] = None,
+        intel_data: Optional[List[PageIntelligence]] = None,
+        use_pool: bool = False,
     ) -> Path:
         """
         Build the HTML report from crawl results.
 
-        Intelligence extraction is run internally on each result's ``text``
-        field, so this method requires no pre-computed intelligence data.
+        Each result is analysed exactly once and every report section reads
+        from that analysis.  Callers that already ran intelligence
+        extraction can pass it as *intel_data* to skip the analysis here.
 
         Args:
             results:    List of :class:`~deepwebharvester.crawler.CrawlResult`.
             output_dir: Directory where the HTML file will be written.
             filename:   Override the auto-generated timestamped filename.
+            intel_data: Optional pre-computed intelligence, one entry per
+                        result in the same order.
+            use_pool:   Let the analysis use a process pool when *intel_data*
+                        is not given (see ``IntelligenceExtractor.analyze_many``).
+                        Off by default.
 
         Returns:
             :class:`~pathlib.Path` to the written HTML file.
+
+        Raises:
+            ValueError: If *intel_data* does not have one entry per result.
         """
         out_dir = Path(output_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -290,10 +314,14 @@ class ReportGenerator:
         ts_str = ts.strftime("%Y%m%d_%H%M%S")
         path = out_dir / (filename or f"report_{ts_str}.html")
 
-        # Run intelligence on every result
-        intel_data: List[PageIntelligence] = [
-            self._intel.analyze(r.url, r.text) for r in results
-        ]
+        if intel_data is None:
+            intel_data = self._intel.analyze_many(
+                ((r.url, r.text) for r in results), use_pool=use_pool
+            )
+        elif len(intel_data) != len(results):
+            raise ValueError(
+                f"intel_data has {len(intel_data)} entries for {len(results)} result(s)"
+            )
 
         html_content = self._build_html(results, intel_data, ts)
         path.write_text(html_content, encoding="utf-8")
@@ -419,12 +447,12 @@ class ReportGenerator:
             "Medium":   "#e3b341",
             "Low":      "#3fb950",
         }
-        rows = ""
+        rows: List[str] = []
         for label in ("Critical", "High", "Medium", "Low"):
             count = dist.get(label, 0)
             pct   = int(count / max(total, 1) * 100)
             color = colors.get(label, "#8b949e")
-            rows += (
+            rows.append(
                 '<div class="risk-bar-row">'
                 f'<div class="risk-bar-label">{_risk_badge(label)}</div>'
                 '<div class="risk-bar-track">'
@@ -436,7 +464,7 @@ class ReportGenerator:
         return (
             '<div class="section">'
             '<div class="section-title"><span class="accent">02.</span> Risk Distribution</div>'
-            f'<div class="risk-bar">{rows}</div>'
+            f'<div class="risk-bar">{"".join(rows)}</div>'
             "</div>"
         )
 
@@ -525,18 +553,19 @@ class ReportGenerator:
                 "<p style='color:#6e7681'>No high-risk pages detected.</p>"
                 "</div>"
             )
-        rows = ""
+        rows: List[str] = []
         for result, p in pages[:50]:
             cats = ", ".join(p.threat.categories[:3]) or "—"
-            rows += (
+            url = _e(result.url)
+            rows.append(
                 f"<tr>"
-                f"<td class='mono truncate' title='{_e(result.url)}'>"
-                f"<a href='{_e(result.url)}'>{_e(result.url[:70])}</a></td>"
+                f"<td class='mono truncate' title='{url}'>"
+                f"<a href='{url}'>{_e(result.url[:70])}</a></td>"
                 f"<td>{_e(result.title[:60])}</td>"
                 f"<td>{_risk_badge(p.threat.risk_label)}</td>"
-                f"<td class='mono'>{_e(str(p.threat.risk_score))}</td>"
+                f"<td class='mono'>{p.threat.risk_score}</td>"
                 f"<td>{_e(cats)}</td>"
-                f"<td class='mono'>{_e(str(p.iocs.total))}</td>"
+                f"<td class='mono'>{p.iocs.total}</td>"
                 f"</tr>"
             )
         return (
@@ -548,7 +577,7 @@ class ReportGenerator:
             "<th>URL</th><th>Title</th><th>Risk</th>"
             "<th>Score</th><th>Categories</th><th>IOCs</th>"
             "</tr></thead>"
-            f"<tbody>{rows}</tbody>"
+            f"<tbody>{''.join(rows)}</tbody>"
             "</table></div></div>"
         )
 
@@ -563,7 +592,7 @@ class ReportGenerator:
         for r, p in zip(results, intel):
             site_data[r.site].append((r, p))
 
-        cards = ""
+        cards: List[str] = []
         for site in sites:
             pages = site_data[site]
             if not pages:
@@ -578,7 +607,7 @@ class ReportGenerator:
                 {cat for _, p in pages for cat in p.threat.categories}
             )
             all_iocs = sum(p.iocs.total for _, p in pages)
-            cards += (
+            cards.append(
                 '<div class="site-card">'
                 '<div class="site-card-header">'
                 f'<span class="site-url">{_e(site)}</span>'
@@ -600,16 +629,16 @@ class ReportGenerator:
         return (
             '<div class="section">'
             '<div class="section-title"><span class="accent">06.</span> Site Breakdown</div>'
-            + cards
+            + "".join(cards)
             + "</div>"
         )
 
     def _url_index(
         self, results: List[CrawlResult], intel: List[PageIntelligence]
     ) -> str:
-        rows = ""
+        rows: List[str] = []
         for r, p in zip(results, intel):
-            rows += (
+            rows.append(
                 f"<tr>"
                 f"<td class='mono' style='font-size:11px'>{_e(r.url[:80])}</td>"
                 f"<td>{_e(r.title[:60])}</td>"
@@ -625,7 +654,7 @@ class ReportGenerator:
             '<div class="table-wrap"><table>'
             "<thead><tr><th>URL</th><th>Title</th><th>Depth</th>"
             "<th>Risk</th><th>IOCs</th><th>Hash</th></tr></thead>"
-            f"<tbody>{rows}</tbody>"
+            f"<tbody>{''.join(rows)}</tbody>"
             "</table></div></div>"
         )
 
@@ -17,6 +17,11 @@ from typing import TYPE_CHECKING, Dict, List, Optional, Set
 
 from .crawler import CrawlResult
 
+try:  # optional C JSON encoder, several times faster for large exports
+    import orjson
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    orjson = None  # type: ignore[assignment]
+
 if TYPE_CHECKING:
     from .intelligence import PageIntelligence
 
@@ -40,6 +45,25 @@ CREATE INDEX IF NOT EXISTS idx_site ON crawl_results(site);
 CREATE INDEX IF NOT EXISTS idx_hash ON crawl_results(content_hash);
 """
 
+# Flatten page text onto one CSV line
+_NEWLINES_TO_SPACES = str.maketrans({"\n": " ", "\r": " "})
+
+_INSERT_SQL = """
+INSERT OR IGNORE INTO crawl_results
+    (url, title, text, content_hash, depth,
+     crawl_time, links_found, site, ioc_data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _dumps_indented(payload: object) -> bytes:
+    """Serialise *payload* as 2-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    # With indent set, json.dump falls back to the pure-Python encoder and
+    # issues many small writes; encoding in one go is faster.
+    return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
 
 class StorageManager:
     """
@@ -52,6 +76,9 @@ class StorageManager:
         json_output:   Enable JSON export.
         csv_output:    Enable CSV export.
         sqlite_output: Enable SQLite persistence (also required for resume).
+
+    The SQLite connection stays open until :meth:`close` is called; the
+    manager can also be used as a context manager.
     """
 
     def __init__(
@@ -68,28 +95,58 @@ class StorageManager:
         self.json_output = json_output
         self.csv_output = csv_output
         self.sqlite_output = sqlite_output
+        self._conn: Optional[sqlite3.Connection] = None
 
         if self.sqlite_output:
             self._init_db()
 
+    def __enter__(self) -> "StorageManager":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the SQLite connection, if one is open.  Safe to call twice."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
     # ── SQLite ────────────────────────────────────────────────────────────────
 
     # Seconds to wait for a database lock before raising OperationalError
     _DB_TIMEOUT: float = 10.0
 
     def _connect(self) -> sqlite3.Connection:
-        """Open a SQLite connection with a sensible lock timeout."""
-        return sqlite3.connect(self._db_path, timeout=self._DB_TIMEOUT)
+        """
+        Return the manager's SQLite connection, opening it on first use.
+
+        One connection is kept for the manager's lifetime so repeated calls
+        reuse a warm page cache instead of re-opening the file.  It may be
+        handed between threads, but must not be used by two at once.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self._db_path, timeout=self._DB_TIMEOUT, check_same_thread=False
+            )
+            # Safe with WAL: a crash can lose the last commit but never corrupts
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn = conn
+        return self._conn
 
     def _init_db(self) -> None:
-        with self._connect() as conn:
+        conn = self._connect()
+        with conn:
+            # WAL is persistent in the database file, so set it once here
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript(_SCHEMA)
-            # Migrate existing databases that predate the ioc_data column
-            try:
+        # Migrate existing databases that predate the ioc_data column
+        try:
+            with conn:
                 conn.execute("ALTER TABLE crawl_results ADD COLUMN ioc_data TEXT")
-                conn.commit()
-            except sqlite3.OperationalError:
-                pass  # Column already exists
+        except sqlite3.OperationalError:
+            pass  # Column already exists
 
     def get_known_urls(self) -> Set[str]:
         """
@@ -98,11 +155,13 @@ class StorageManager:
         Used by the crawler to implement *resume* mode: previously crawled
         URLs are skipped on the next run.
         """
-        if not self.sqlite_output or not self._db_path.exists():
+        if not self.sqlite_output:
             return set()
-        with self._connect() as conn:
-            rows = conn.execute("SELECT url FROM crawl_results").fetchall()
-        return {row[0] for row in rows}
+        # Iterate the cursor directly rather than materialising fetchall().
+        # The UNIQUE constraint on url already gives SQLite a covering index
+        # to scan, so no separate index is needed for this query.
+        cursor = self._connect().execute("SELECT url FROM crawl_results")
+        return {url for (url,) in cursor}
 
     def save_to_sqlite(
         self,
@@ -123,33 +182,43 @@ class StorageManager:
         """
         if not self.sqlite_output:
             return 0
-        inserted = 0
         intel_map: Dict[str, str] = {}
         if intel:
             intel_map = {p.url: json.dumps(p.iocs.as_dict()) for p in intel}
 
-        with self._connect() as conn:
-            for r in results:
-                ioc_json = intel_map.get(r.url)
-                try:
-                    conn.execute(
-                        """
-                        INSERT OR IGNORE INTO crawl_results
-                            (url, title, text, content_hash, depth,
-                             crawl_time, links_found, site, ioc_data)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            r.url, r.title, r.text, r.content_hash,
-                            r.depth, r.crawl_time, r.links_found, r.site,
-                            ioc_json,
-                        ),
-                    )
-                    if conn.execute("SELECT changes()").fetchone()[0]:
-                        inserted += 1
-                except sqlite3.Error as exc:
-                    logger.error("SQLite insert failed for %s: %s", r.url, exc)
-            conn.commit()
+        rows = [
+            (
+                r.url, r.title, r.text, r.content_hash,
+                r.depth, r.crawl_time, r.links_found, r.site,
+                intel_map.get(r.url),
+            )
+            for r in results
+        ]
+        conn = self._connect()
+        # ignored duplicates do not count towards total_changes
+        before = conn.total_changes
+        try:
+            # One prepared statement and one transaction for the whole batch
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+        except sqlite3.Error as batch_exc:
+            logger.warning(
+                "SQLite batch insert of %d result(s) failed (%s); retrying row by row",
+                len(rows), batch_exc,
+            )
+            # The batch was rolled back, but rows it wrote still count
+            before = conn.total_changes
+            try:
+                with conn:
+                    for row in rows:
+                        try:
+                            conn.execute(_INSERT_SQL, row)
+                        except sqlite3.Error as row_exc:
+                            logger.error("SQLite insert failed for %s: %s", row[0], row_exc)
+            except sqlite3.Error as exc:
+                logger.error("SQLite insert of %d result(s) failed: %s", len(rows), exc)
+                before = conn.total_changes
+        inserted = conn.total_changes - before
         logger.info("SQLite: %d new row(s) saved → %s", inserted, self._db_path)
         return inserted
 
@@ -172,22 +241,10 @@ class StorageManager:
         """
         ts = datetime.now(tz=timezone.utc).strftime("%Y%m%d_%H%M%S")
         path = self._dir / (filename or f"results_{ts}.json")
-        payload = [
-            {
-                "url": r.url,
-                "site": r.site,
-                "title": r.title,
-                "depth": r.depth,
-                "crawl_time_s": round(r.crawl_time, 3),
-                "links_found": r.links_found,
-                "content_hash": r.content_hash,
-                "text": r.text,
-            }
-            for r in results
-        ]
+        payload = [r.as_dict() for r in results]
         try:
-            with open(path, "w", encoding="utf-8") as fh:
-                json.dump(payload, fh, indent=2, ensure_ascii=False)
+            with open(path, "wb") as fh:
+                fh.write(_dumps_indented(payload))
             logger.info("JSON: %d result(s) → %s", len(payload), path)
         except OSError as exc:
             logger.error("Failed to write JSON output: %s", exc)
@@ -219,13 +276,12 @@ class StorageManager:
                     ["URL", "Site", "Title", "Depth",
                      "CrawlTime(s)", "LinksFound", "ContentHash", "Text"]
                 )
-                for r in results:
-                    clean = r.text.replace("\n", " ").replace("\r", " ")
-                    writer.writerow(
-                        [r.url, r.site, r.title, r.depth,
-                         round(r.crawl_time, 3), r.links_found,
-                         r.content_hash, clean]
-                    )
+                writer.writerows(
+                    (r.url, r.site, r.title, r.depth,
+                     round(r.crawl_time, 3), r.links_found,
+                     r.content_hash, r.text.translate(_NEWLINES_TO_SPACES))
+                    for r in results
+                )
             logger.info("CSV: %d result(s) → %s", len(results), path)
         except OSError as exc:
             logger.error("Failed to write CSV output: %s", exc)
@@ -3,13 +3,25 @@ Shared pytest fixtures for the DeepWebHarvester test suite.
 """
 from __future__ import annotations
 
+import copy
+import os
+import sys
+import types
+from typing import Iterator
 from unittest.mock import MagicMock
 
 import pytest
 
+from deepwebharvester.config import AppConfig
 from deepwebharvester.crawler import Crawler
 from deepwebharvester.extractor import PageExtractor
 from deepwebharvester.storage import StorageManager
+from deepwebharvester.tor_manager import TorManager
+
+# Render with the headless Agg backend so matplotlib never probes for a GUI
+# toolkit, whatever the developer's own MPLBACKEND says.  None of the imports
+# above load matplotlib, and conftest runs before any test module does.
+os.environ["MPLBACKEND"] = "Agg"
 
 # ── Constants used across tests ───────────────────────────────────────────────
 
@@ -40,6 +52,42 @@ def extractor() -> PageExtractor:
     return PageExtractor(blacklist_paths=["/login", "/register", "/signup"])
 
 
+@pytest.fixture(scope="module")
+def manager() -> TorManager:
+    """Real TorManager shared by a test module.
+
+    Tests that replace methods or touch counters on it must do so through
+    ``monkeypatch`` so the change is undone before the next test.
+    """
+    return TorManager(
+        socks_host="127.0.0.1",
+        socks_port=9050,
+        control_host="127.0.0.1",
+        control_port=9051,
+        control_password="test_password_123",
+        user_agent="DeepWebHarvester/2.0 (test)",
+    )
+
+
+@pytest.fixture
+def fake_stem(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Install stand-in ``stem`` modules and return the fake Controller class.
+
+    TorManager.renew_circuit imports stem lazily, so the stand-ins are
+    picked up without loading stem.control's C-extension dependencies.
+    """
+    controller_cls = MagicMock()
+    stem_mod = types.ModuleType("stem")
+    stem_mod.Signal = types.SimpleNamespace(NEWNYM="NEWNYM")  # type: ignore[attr-defined]
+    for name in ("SocketError", "OperationFailed", "ProtocolError"):
+        setattr(stem_mod, name, type(name, (Exception,), {}))
+    ctrl_mod = types.ModuleType("stem.control")
+    ctrl_mod.Controller = controller_cls  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "stem", stem_mod)
+    monkeypatch.setitem(sys.modules, "stem.control", ctrl_mod)
+    return controller_cls
+
+
 @pytest.fixture
 def mock_tor_manager() -> MagicMock:
     """TorManager mock that returns a session pre-configured with a fake response."""
@@ -73,12 +121,25 @@ def fast_crawler(mock_tor_manager: MagicMock, extractor: PageExtractor) -> Crawl
 
 
 @pytest.fixture
-def tmp_storage(tmp_path) -> StorageManager:
+def tmp_storage(tmp_path) -> Iterator[StorageManager]:
     """StorageManager writing to a temporary directory."""
-    return StorageManager(
+    with StorageManager(
         output_dir=str(tmp_path),
         db_name="test.db",
         json_output=True,
         csv_output=True,
         sqlite_output=True,
-    )
+    ) as storage:
+        yield storage
+
+
+@pytest.fixture(scope="session")
+def template_config() -> AppConfig:
+    """Default AppConfig built once per session; use ``app_config`` to get a mutable copy."""
+    return AppConfig()
+
+
+@pytest.fixture
+def app_config(template_config: AppConfig) -> AppConfig:
+    """Independent deep copy of the session's default AppConfig."""
+    return copy.deepcopy(template_config)
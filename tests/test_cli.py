@@ -5,11 +5,14 @@ Uses mocks to avoid network calls or real Tor connections.
 """
 from __future__ import annotations
 
+import sqlite3
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from deepwebharvester.cli import _build_parser, main
+from deepwebharvester.crawler import CrawlResult
+from deepwebharvester.storage import StorageManager
 
 
 # ── Argument parser ───────────────────────────────────────────────────────────
@@ -132,6 +135,35 @@ class TestMainExitCodes:
         code = main(["--url", VALID_ONION, "--output", str(tmp_path)])
         assert code == 0
 
+    @patch("deepwebharvester.cli.Crawler")
+    @patch("deepwebharvester.cli.TorManager")
+    def test_storage_closed_when_save_raises(
+        self,
+        mock_tor_cls: MagicMock,
+        mock_crawler_cls: MagicMock,
+        tmp_path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A failing save must not leave the SQLite connection open."""
+        result = CrawlResult(
+            url=VALID_ONION, title="T", text="body", content_hash="h" * 64,
+            depth=0, crawl_time=0.1, links_found=0, site=VALID_ONION,
+        )
+        mock_crawler_cls.return_value = _make_mock_crawler([result])
+        managers = []
+
+        def _failing_save_all(self, results, intel=None):
+            managers.append(self)
+            self._connect()
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(StorageManager, "save_all", _failing_save_all)
+
+        with pytest.raises(sqlite3.OperationalError):
+            main(["--url", VALID_ONION, "--output", str(tmp_path)])
+        assert len(managers) == 1
+        assert managers[0]._conn is None
+
     @patch("deepwebharvester.cli.Crawler")
     @patch("deepwebharvester.cli.StorageManager")
     @patch("deepwebharvester.cli.TorManager")
@@ -376,7 +408,7 @@ class TestHtmlReportGeneration:
             page_intel = MagicMock()
             page_intel.iocs = MagicMock(total=0, cves=[], btc_addresses=[], emails=[])
             page_intel.threat = MagicMock(risk_label="Low", categories=[])
-            mock_intel.analyze.return_value = page_intel
+            mock_intel.analyze_many.return_value = [page_intel]
             mock_intel_cls.return_value = mock_intel
 
             with patch("deepwebharvester.cli.GraphVisualizer") as mock_viz_cls:
@@ -388,6 +420,8 @@ class TestHtmlReportGeneration:
 
         assert code == 0
         mock_report.generate.assert_called_once()
+        # The CLI's own intelligence pass is reused rather than recomputed
+        assert mock_report.generate.call_args.kwargs["intel_data"] == [page_intel]
 
     @patch("deepwebharvester.cli.ReportGenerator")
     @patch("deepwebharvester.cli.Crawler")
@@ -450,7 +484,7 @@ class TestHtmlReportGeneration:
             page_intel = MagicMock()
             page_intel.iocs = MagicMock(total=0, cves=[], btc_addresses=[], emails=[])
             page_intel.threat = MagicMock(risk_label="Low", categories=[])
-            mock_intel.analyze.return_value = page_intel
+            mock_intel.analyze_many.return_value = [page_intel]
             mock_intel_cls.return_value = mock_intel
 
             with patch("deepwebharvester.cli.GraphVisualizer") as mock_viz_cls:
@@ -508,7 +542,7 @@ class TestGraphGeneration:
             page_intel = MagicMock()
             page_intel.iocs = MagicMock(total=0, cves=[], btc_addresses=[], emails=[])
             page_intel.threat = MagicMock(risk_label="Low", categories=[])
-            mock_intel.analyze.return_value = page_intel
+            mock_intel.analyze_many.return_value = [page_intel]
             mock_intel_cls.return_value = mock_intel
 
             code = main(["--url", VALID_ONION, "--output", str(tmp_path)])
@@ -558,7 +592,7 @@ class TestGraphGeneration:
             page_intel = MagicMock()
             page_intel.iocs = MagicMock(total=0, cves=[], btc_addresses=[], emails=[])
             page_intel.threat = MagicMock(risk_label="Low", categories=[])
-            mock_intel.analyze.return_value = page_intel
+            mock_intel.analyze_many.return_value = [page_intel]
             mock_intel_cls.return_value = mock_intel
 
             main(["--url", VALID_ONION, "--output", str(tmp_path)])
@@ -33,6 +33,32 @@ class TestCrawlStats:
         assert stats.elapsed >= 0.0
 
 
+# ── CrawlResult ───────────────────────────────────────────────────────────────
+
+
+class TestCrawlResult:
+    def _result(self) -> CrawlResult:
+        return CrawlResult(
+            url=VALID_ONION, title="T", text="body", content_hash="h",
+            depth=1, crawl_time=0.12345, links_found=2, site=VALID_ONION,
+        )
+
+    def test_uses_slots(self) -> None:
+        assert not hasattr(self._result(), "__dict__")
+
+    def test_as_dict_export_record(self) -> None:
+        assert self._result().as_dict() == {
+            "url": VALID_ONION,
+            "site": VALID_ONION,
+            "title": "T",
+            "depth": 1,
+            "crawl_time_s": 0.123,
+            "links_found": 2,
+            "content_hash": "h",
+            "text": "body",
+        }
+
+
 # ── Basic crawl_site ──────────────────────────────────────────────────────────
 
 
@@ -173,6 +199,18 @@ class TestCrawlAll:
         # Only the valid URL should produce results
         assert len(results) >= 1
 
+    def test_invalid_urls_warned_once_in_input_order(
+        self, fast_crawler: Crawler, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        other = "http://another.example.org"
+        with caplog.at_level("WARNING", logger="deepwebharvester.crawler"):
+            fast_crawler.crawl_all([other, INVALID_URL, other, VALID_ONION])
+        skipped = [
+            r.args[0] for r in caplog.records
+            if r.getMessage().startswith("Invalid or non-.onion URL skipped")
+        ]
+        assert skipped == [other, INVALID_URL]
+
     def test_empty_list_returns_empty(self, fast_crawler: Crawler) -> None:
         results = fast_crawler.crawl_all([])
         assert results == []
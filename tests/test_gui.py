@@ -6,6 +6,9 @@ without a display server (the tests are skipped if Tkinter is unavailable).
 """
 from __future__ import annotations
 
+import logging
+from operator import attrgetter
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -50,47 +53,69 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+@pytest.fixture(autouse=True)
+def _restore_root_logger():
+    """Undo the handler/level changes App._setup_logging makes to the root logger.
+
+    Without this every App instance leaves its QueueHandler attached, so the
+    handler list grows with each test and every log record fans out to all of them.
+    """
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    saved_level = root.level
+    yield
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+@pytest.fixture(autouse=True)
+def mock_err(monkeypatch) -> MagicMock:
+    """Replace messagebox.showerror for every test so no modal dialog can block."""
+    mock = MagicMock()
+    monkeypatch.setattr("deepwebharvester.gui.messagebox.showerror", mock)
+    return mock
+
+
 # ---------------------------------------------------------------------------
 # QueueHandler (no display needed)
 # ---------------------------------------------------------------------------
 
+def _mk_record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(
+        name="test", level=level,
+        pathname="", lineno=0,
+        msg=msg, args=(), exc_info=None,
+    )
+
+
 class TestQueueHandler:
-    import queue as _q
+    # SimpleQueue: these tests are single-threaded, so Queue's locking is unnecessary
 
     def test_emit_puts_record_in_queue(self) -> None:
-        import logging
         import queue
 
-        q: queue.Queue = queue.Queue()
+        q: queue.SimpleQueue = queue.SimpleQueue()
         handler = QueueHandler(q)
         handler.setFormatter(logging.Formatter("%(message)s"))
 
-        record = logging.LogRecord(
-            name="test", level=logging.INFO,
-            pathname="", lineno=0,
-            msg="hello world", args=(), exc_info=None,
-        )
-        handler.emit(record)
+        handler.emit(_mk_record("hello world"))
         assert not q.empty()
         retrieved = q.get_nowait()
         assert retrieved.getMessage() == "hello world"
 
-    def test_multiple_records_queued(self) -> None:
-        import logging
+    @pytest.mark.parametrize("n", [5, pytest.param(1000, marks=pytest.mark.slow)])
+    def test_multiple_records_queued(self, n: int) -> None:
         import queue
 
-        q: queue.Queue = queue.Queue()
+        q: queue.SimpleQueue = queue.SimpleQueue()
         handler = QueueHandler(q)
 
-        for i in range(5):
-            record = logging.LogRecord(
-                name="test", level=logging.DEBUG,
-                pathname="", lineno=0,
-                msg=f"msg {i}", args=(), exc_info=None,
-            )
+        records = [_mk_record(f"msg {i}", logging.DEBUG) for i in range(n)]
+        for record in records:
             handler.emit(record)
 
-        assert q.qsize() == 5
+        assert q.qsize() == n
+        assert q.get_nowait() is records[0]
 
 
 # ---------------------------------------------------------------------------
@@ -165,6 +190,21 @@ class TestAppConstruction:
 # _collect_config
 # ---------------------------------------------------------------------------
 
+# (settings var on App, value to set, dotted path on AppConfig, expected value)
+_OVERRIDE_CASES = [
+    ("_depth_var",      "3",            "crawler.max_depth",        3),
+    ("_workers_var",    "7",            "crawler.max_workers",      7),
+    ("_delay_var",      "2.5",          "crawler.crawl_delay",      2.5),
+    ("_tor_port_var",   "19050",        "tor.socks_port",           19050),
+    ("_ctrl_pass_var",  "secret_pw",    "tor.control_password",     "secret_pw"),
+    ("_renew_var",      "5",            "tor.renew_circuit_every",  5),
+    ("_output_dir_var", "/tmp/harvest", "storage.output_dir",       "/tmp/harvest"),
+    ("_json_var",       False,          "storage.json_output",      False),
+    ("_csv_var",        False,          "storage.csv_output",       False),
+    ("_sqlite_var",     False,          "storage.sqlite_output",    False),
+]
+
+
 class TestCollectConfig:
     @pytest.fixture
     def app(self):
@@ -176,11 +216,11 @@ class TestCollectConfig:
         except tk.TclError:
             pytest.skip("Cannot create App without display")
 
-    def test_returns_none_when_no_urls(self, app: App) -> None:
+    def test_returns_none_when_no_urls(self, app: App, mock_err: MagicMock) -> None:
         app._url_text.delete("1.0", tk.END)
-        with patch("deepwebharvester.gui.messagebox.showerror"):
-            result = app._collect_config()
+        result = app._collect_config()
         assert result is None
+        mock_err.assert_called_once()
 
     def test_returns_config_with_valid_url(self, app: App) -> None:
         url = "http://" + "a" * 56 + ".onion"
@@ -201,32 +241,16 @@ class TestCollectConfig:
         assert cfg is not None
         assert len(cfg.seed_urls) == 2
 
-    def test_depth_applied_to_config(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
+    @pytest.mark.parametrize("var_attr, value, cfg_path, expected", _OVERRIDE_CASES)
+    def test_override_applied_to_config(
+        self, app: App, var_attr: str, value, cfg_path: str, expected
+    ) -> None:
         app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._depth_var.set("3")
+        app._url_text.insert("1.0", "http://" + "a" * 56 + ".onion")
+        getattr(app, var_attr).set(value)
         cfg = app._collect_config()
         assert cfg is not None
-        assert cfg.crawler.max_depth == 3
-
-    def test_output_dir_applied_to_config(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._output_dir_var.set("/tmp/harvest")
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.storage.output_dir == "/tmp/harvest"
-
-    def test_no_json_applied(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._json_var.set(False)
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.storage.json_output is False
+        assert attrgetter(cfg_path)(cfg) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -326,10 +350,9 @@ class TestAppInitialization:
         assert app._crawl_thread is None
 
     def test_queue_handler_attached(self, app: App) -> None:
-        import logging
         root_logger = logging.getLogger()
-        handler_types = [type(h).__name__ for h in root_logger.handlers]
-        assert "QueueHandler" in handler_types
+        queue_handlers = [h for h in root_logger.handlers if isinstance(h, QueueHandler)]
+        assert queue_handlers == [app._queue_handler]
 
     def test_url_text_is_text_widget(self, app: App) -> None:
         assert isinstance(app._url_text, tk.Text)
@@ -367,26 +390,21 @@ class TestBrowseOutput:
         except tk.TclError:
             pytest.skip("Cannot create App without display")
 
-    def test_browse_output_sets_directory_when_chosen(self, app: App) -> None:
-        """When the dialog returns a path the output dir var is updated."""
-        with patch("deepwebharvester.gui.filedialog.askdirectory",
-                   return_value="/tmp/chosen_dir"):
+    @pytest.mark.parametrize(
+        "returned, initial, expected",
+        [
+            ("/tmp/chosen_dir", "anything", "/tmp/chosen_dir"),  # path chosen
+            ("", "/original/path", "/original/path"),            # dialog cancelled
+            (None, "/original/path", "/original/path"),          # dialog dismissed
+        ],
+        ids=["chosen", "cancelled", "dismissed"],
+    )
+    def test_browse_output(self, app: App, returned, initial: str, expected: str) -> None:
+        """The output dir var only changes when the dialog returns a path."""
+        app._output_dir_var.set(initial)
+        with patch("deepwebharvester.gui.filedialog.askdirectory", return_value=returned):
             app._browse_output()
-        assert app._output_dir_var.get() == "/tmp/chosen_dir"
-
-    def test_browse_output_no_change_when_cancelled(self, app: App) -> None:
-        """When the dialog is cancelled (returns empty string), var is unchanged."""
-        app._output_dir_var.set("/original/path")
-        with patch("deepwebharvester.gui.filedialog.askdirectory", return_value=""):
-            app._browse_output()
-        assert app._output_dir_var.get() == "/original/path"
-
-    def test_browse_output_no_change_when_none_returned(self, app: App) -> None:
-        """When the dialog returns None (dialog dismissed), var is unchanged."""
-        app._output_dir_var.set("/original/path")
-        with patch("deepwebharvester.gui.filedialog.askdirectory", return_value=None):
-            app._browse_output()
-        assert app._output_dir_var.get() == "/original/path"
+        assert app._output_dir_var.get() == expected
 
 
 # ---------------------------------------------------------------------------
@@ -523,10 +541,18 @@ class TestOnClosing:
         assert str(app._stop_btn["state"]) == tk.DISABLED
         assert "error" in app._status_var.get().lower() or "Error" in app._status_var.get()
 
-    def test_on_crawl_error_shows_messagebox(self, app: App) -> None:
-        """_on_crawl_error should call messagebox.showerror."""
-        with patch("deepwebharvester.gui.messagebox.showerror") as mock_err:
-            app._on_crawl_error("boom")
+    def test_on_crawl_error_shows_messagebox(self, tk_root, mock_err: MagicMock) -> None:
+        """_on_crawl_error should call messagebox.showerror.
+
+        Only the status var and the UI-state toggle are touched, so a stub
+        stands in for a full App here.
+        """
+        stub = SimpleNamespace(
+            _set_ui_running=MagicMock(),
+            _status_var=tk.StringVar(master=tk_root),
+        )
+        App._on_crawl_error(stub, "boom")
+        stub._set_ui_running.assert_called_once_with(False)
         mock_err.assert_called_once()
         call_args = mock_err.call_args
         assert "boom" in str(call_args)
@@ -555,81 +581,23 @@ class TestSettingsPersistence:
             except Exception:
                 pytest.fail("_load_defaults raised an exception unexpectedly")
 
-    def test_load_defaults_populates_urls_from_config(self, app: App) -> None:
+    def test_load_defaults_populates_urls_from_config(
+        self, app: App, app_config, monkeypatch
+    ) -> None:
         """If config has seed_urls they should be loaded into the text widget."""
-        from deepwebharvester.config import AppConfig
-        cfg = AppConfig()
+        cfg = app_config
         cfg.seed_urls = ["http://" + "c" * 56 + ".onion"]
         app._url_text.delete("1.0", tk.END)
-        with patch("deepwebharvester.gui.load_config", return_value=cfg):
-            with patch("deepwebharvester.gui.Path.exists", return_value=False):
-                app._load_defaults()
+        monkeypatch.setattr("deepwebharvester.gui.load_config", lambda *a, **kw: cfg)
+        # gui.Path is pathlib.Path itself, so swap the module-level name rather
+        # than patching Path.exists for the whole process.
+        monkeypatch.setattr(
+            "deepwebharvester.gui.Path", lambda _p: SimpleNamespace(exists=lambda: False)
+        )
+        app._load_defaults()
         content = app._url_text.get("1.0", tk.END).strip()
         assert "c" * 56 + ".onion" in content
 
-    def test_collect_config_workers_override(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._workers_var.set("7")
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.crawler.max_workers == 7
-
-    def test_collect_config_delay_override(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._delay_var.set("2.5")
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.crawler.crawl_delay == 2.5
-
-    def test_collect_config_tor_port_override(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._tor_port_var.set("19050")
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.tor.socks_port == 19050
-
-    def test_collect_config_no_csv_applied(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._csv_var.set(False)
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.storage.csv_output is False
-
-    def test_collect_config_no_sqlite_applied(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._sqlite_var.set(False)
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.storage.sqlite_output is False
-
-    def test_collect_config_control_password(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._ctrl_pass_var.set("secret_pw")
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.tor.control_password == "secret_pw"
-
-    def test_collect_config_renew_circuit_every(self, app: App) -> None:
-        url = "http://" + "a" * 56 + ".onion"
-        app._url_text.delete("1.0", tk.END)
-        app._url_text.insert("1.0", url)
-        app._renew_var.set("5")
-        cfg = app._collect_config()
-        assert cfg is not None
-        assert cfg.tor.renew_circuit_every == 5
-
 
 # ---------------------------------------------------------------------------
 # _start_crawl validation (missing URL, missing output dir)
@@ -646,26 +614,25 @@ class TestStartCrawlValidation:
         except tk.TclError:
             pytest.skip("Cannot create App without display")
 
-    def test_on_start_shows_error_when_no_urls(self, app: App) -> None:
+    def test_on_start_shows_error_when_no_urls(self, app: App, mock_err: MagicMock) -> None:
         """_on_start calls _collect_config which shows an error for empty URLs."""
         app._url_text.delete("1.0", tk.END)
-        with patch("deepwebharvester.gui.messagebox.showerror") as mock_err:
-            app._on_start()
+        app._on_start()
         mock_err.assert_called_once()
 
     def test_on_start_does_not_start_thread_with_no_urls(self, app: App) -> None:
         """When URL validation fails, no crawl thread should be started."""
         app._url_text.delete("1.0", tk.END)
-        with patch("deepwebharvester.gui.messagebox.showerror"):
-            app._on_start()
+        app._on_start()
         assert app._crawl_thread is None
 
-    def test_on_start_with_whitespace_only_is_treated_as_no_urls(self, app: App) -> None:
+    def test_on_start_with_whitespace_only_is_treated_as_no_urls(
+        self, app: App, mock_err: MagicMock
+    ) -> None:
         """Whitespace-only URL field should produce no valid URLs."""
         app._url_text.delete("1.0", tk.END)
         app._url_text.insert("1.0", "   \n   \n   ")
-        with patch("deepwebharvester.gui.messagebox.showerror") as mock_err:
-            app._on_start()
+        app._on_start()
         mock_err.assert_called_once()
 
     def test_collect_config_falls_back_for_empty_output_dir(self, app: App) -> None:
@@ -678,25 +645,30 @@ class TestStartCrawlValidation:
         assert cfg is not None
         assert cfg.storage.output_dir == "results"
 
-    def test_on_start_sets_ui_running_when_valid(self, app: App) -> None:
+    def test_on_start_sets_ui_running_when_valid(self, app: App, monkeypatch) -> None:
         """A valid start should put the UI into running state."""
         url = "http://" + "a" * 56 + ".onion"
         app._url_text.delete("1.0", tk.END)
         app._url_text.insert("1.0", url)
-        with patch.object(app, "_crawl_worker"):
-            # Patch the thread so it doesn't actually run
-            with patch("deepwebharvester.gui.threading.Thread") as mock_thread_cls:
-                mock_thread = MagicMock()
-                mock_thread_cls.return_value = mock_thread
-                app._on_start()
+        # Stop at the thread-launch boundary so no crawl thread is created
+        monkeypatch.setattr(App, "_launch_crawl_thread", lambda self, cfg: None)
+        app._on_start()
         assert str(app._start_btn["state"]) == tk.DISABLED
 
-    def test_on_start_status_var_updates_when_valid(self, app: App) -> None:
+    def test_on_start_status_var_updates_when_valid(self, app: App, monkeypatch) -> None:
         url = "http://" + "a" * 56 + ".onion"
         app._url_text.delete("1.0", tk.END)
         app._url_text.insert("1.0", url)
-        with patch("deepwebharvester.gui.threading.Thread") as mock_thread_cls:
-            mock_thread = MagicMock()
-            mock_thread_cls.return_value = mock_thread
-            app._on_start()
+        monkeypatch.setattr(App, "_launch_crawl_thread", lambda self, cfg: None)
+        app._on_start()
         assert app._status_var.get() != "Ready"
+
+    def test_on_start_launches_crawl_thread_with_config(self, app: App, monkeypatch) -> None:
+        url = "http://" + "a" * 56 + ".onion"
+        app._url_text.delete("1.0", tk.END)
+        app._url_text.insert("1.0", url)
+        launched = []
+        monkeypatch.setattr(App, "_launch_crawl_thread", lambda self, cfg: launched.append(cfg))
+        app._on_start()
+        assert len(launched) == 1
+        assert launched[0].seed_urls == [url]
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import pytest
 
+from deepwebharvester import intelligence
 from deepwebharvester.intelligence import (
     IntelligenceExtractor,
     IOCs,
@@ -22,6 +23,13 @@ def extractor() -> IntelligenceExtractor:
     return IntelligenceExtractor()
 
 
+class _TaggingExtractor(IntelligenceExtractor):
+    """Subclass whose results differ from the base class (module-level: picklable)."""
+
+    def analyze(self, url, text):
+        return super().analyze(url + "#tagged", text)
+
+
 # ---------------------------------------------------------------------------
 # IOCs dataclass
 # ---------------------------------------------------------------------------
@@ -115,12 +123,14 @@ class TestExtractIOCsIPv4:
         assert "203.0.113.5" in iocs.ipv4
 
     def test_private_ipv4_excluded(self, extractor):
-        text = "Internal: 10.0.0.1 192.168.1.1 127.0.0.1 172.16.0.1"
+        text = "Internal: 10.0.0.1 192.168.1.1 127.0.0.1 172.16.0.1 172.31.255.1 169.254.1.1"
         iocs = extractor.extract_iocs(text)
-        # Only 172.16.0.1 is not in the _PRIVATE_PREFIXES list
-        assert "10.0.0.1" not in iocs.ipv4
-        assert "192.168.1.1" not in iocs.ipv4
-        assert "127.0.0.1" not in iocs.ipv4
+        assert iocs.ipv4 == []
+
+    def test_ipv4_next_to_private_ranges_kept(self, extractor):
+        text = "Edge: 172.15.0.1 172.32.0.1 192.169.0.1 11.0.0.1"
+        iocs = extractor.extract_iocs(text)
+        assert iocs.ipv4 == ["11.0.0.1", "172.15.0.1", "172.32.0.1", "192.169.0.1"]
 
     def test_loopback_excluded(self, extractor):
         iocs = extractor.extract_iocs("Connect to 127.0.0.1:8080")
@@ -170,6 +180,14 @@ class TestExtractIOCsHashes:
         iocs = extractor.extract_iocs(f"{md5} {md5}")
         assert iocs.md5.count(md5) == 1
 
+    def test_mixed_hashes_bucketed_by_length(self, extractor):
+        md5 = "d41d8cd98f00b204e9800998ecf8427e"
+        sha1 = "da39a3ee5e6b4b0d3255bfef95601890afd80709"
+        iocs = extractor.extract_iocs(f"{sha1} {md5} {'f' * 50}")
+        assert iocs.md5 == [md5]
+        assert iocs.sha1 == [sha1]
+        assert iocs.sha256 == []
+
 
 class TestExtractIOCsCVE:
     def test_cve_detected(self, extractor):
@@ -220,6 +238,32 @@ class TestExtractIOCsOnion:
         iocs = extractor.extract_iocs(f"Visit {onion}")
         assert onion not in iocs.onion_addresses
 
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "b" + "a" * 56 + ".onion",          # label longer than 56
+            "a" * 56 + ".onionx",               # suffix runs on
+            "a" * 55 + "1.onion",               # non-base32 character
+            "x_" + "a" * 56 + ".onion",         # word char before the label
+            "a" * 56 + ".onion_",               # word char after the suffix
+            ".onion",
+        ],
+        ids=["too-long", "suffix-word", "bad-char", "prefix-word", "trailing-word", "bare"],
+    )
+    def test_boundaries_rejected(self, extractor, text):
+        assert extractor.extract_iocs(text).onion_addresses == []
+
+    def test_adjacent_onions_and_original_case_kept(self, extractor):
+        first = "A" * 56 + ".ONION"
+        second = "b" * 56 + ".onion"
+        text = f"({first}/{second}.)"
+        assert extractor.extract_iocs(text).onion_addresses == sorted([first, second])
+
+    def test_offset_shifting_lowercase_matches_regex(self, extractor):
+        # "\u0130".lower() is two characters, so the validator defers to the regex
+        text = "\u0130 " + "c" * 56 + ".onion"
+        assert extractor.extract_iocs(text).onion_addresses == ["c" * 56 + ".onion"]
+
 
 class TestExtractIOCsURL:
     def test_https_url_detected(self, extractor):
@@ -235,6 +279,17 @@ class TestExtractIOCsURL:
         iocs = extractor.extract_iocs(text)
         assert len(iocs.urls) <= 50
 
+    def test_urls_keep_first_distinct_in_page_order(self, extractor):
+        # Repeats must not count towards the cap; later URLs are dropped.
+        text = "https://example.com/dup " * 5 + " ".join(
+            f"https://example.com/page{i:02d}" for i in range(60)
+        )
+        iocs = extractor.extract_iocs(text)
+        expected = ["https://example.com/dup"] + [
+            f"https://example.com/page{i:02d}" for i in range(49)
+        ]
+        assert iocs.urls == sorted(expected)
+
 
 class TestExtractIOCsPGP:
     def test_pgp_block_detected(self, extractor):
@@ -334,6 +389,42 @@ class TestClassifyThreatRiskLabels:
         assert 0.0 <= ta.risk_score <= 10.0
 
 
+class TestKeywordCounting:
+    _TEXTS = (
+        "",
+        "ransomware ransom ransomware",
+        "registeregister shell accesshell access",
+        "database dump dump credit card cvv " * 20,
+    )
+
+    @pytest.mark.parametrize("text", _TEXTS)
+    def test_hits_match_str_count(self, text):
+        expected = [sum(map(text.count, kws)) for _cat, kws, _w in intelligence._CATEGORY_TABLE]
+        assert intelligence._count_keyword_hits(text) == expected
+
+    @pytest.mark.parametrize("text", _TEXTS)
+    def test_fallback_without_automaton(self, monkeypatch, text):
+        with_automaton = intelligence._count_keyword_hits(text)
+        monkeypatch.setattr(intelligence, "_KEYWORD_AUTOMATON", None)
+        assert intelligence._count_keyword_hits(text) == with_automaton
+
+    def test_shared_keyword_counts_for_every_category(self, monkeypatch):
+        if intelligence.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+        table = (
+            ("Drugs", ("dump", "market"), 0.5),
+            ("Data", ("dump", "leak", "dump"), 0.5),
+        )
+        text = "market dump leak dump"
+        monkeypatch.setattr(intelligence, "_CATEGORY_TABLE", table)
+        monkeypatch.setattr(intelligence, "_KEYWORD_AUTOMATON", None)
+        fallback = intelligence._count_keyword_hits(text)
+        monkeypatch.setattr(
+            intelligence, "_KEYWORD_AUTOMATON", intelligence._build_keyword_automaton(table)
+        )
+        assert intelligence._count_keyword_hits(text) == fallback == [3, 5]
+
+
 # ---------------------------------------------------------------------------
 # Combined analysis — analyze()
 # ---------------------------------------------------------------------------
@@ -365,3 +456,71 @@ class TestAnalyze:
         assert set(d.keys()) == {"url", "iocs", "threat"}
         assert isinstance(d["iocs"], dict)
         assert isinstance(d["threat"], dict)
+
+
+class TestAnalyzeMany:
+    PAGES = tuple(
+        (f"http://test{i}.onion/", f"malware 203.0.113.{i} evil{i}@bad.com CVE-2021-{i:04d}")
+        for i in range(40)
+    )
+
+    @pytest.fixture()
+    def force_pool(self, monkeypatch):
+        monkeypatch.delenv(intelligence._NO_POOL_ENV, raising=False)
+        monkeypatch.setattr(intelligence, "_POOL_MIN_CHARS", 1)
+        monkeypatch.setattr(intelligence.os, "cpu_count", lambda: 2)
+
+    def test_matches_analyze_in_order(self, extractor):
+        expected = [extractor.analyze(url, text) for url, text in self.PAGES]
+        assert extractor.analyze_many(self.PAGES) == expected
+
+    def test_empty_input(self, extractor):
+        assert extractor.analyze_many([]) == []
+
+    def test_pool_is_opt_in(self, extractor, force_pool, monkeypatch):
+        monkeypatch.setattr(intelligence, "ProcessPoolExecutor", None)
+        assert len(extractor.analyze_many(self.PAGES)) == len(self.PAGES)
+
+    def test_small_batches_stay_in_process(self, extractor, force_pool, monkeypatch):
+        monkeypatch.setattr(intelligence, "_POOL_MIN_CHARS", 10**9)
+        monkeypatch.setattr(intelligence, "ProcessPoolExecutor", None)
+        assert len(extractor.analyze_many(self.PAGES, use_pool=True)) == len(self.PAGES)
+
+    @pytest.mark.slow
+    def test_pool_matches_in_process(self, extractor, force_pool):
+        expected = [extractor.analyze(url, text) for url, text in self.PAGES]
+        assert extractor.analyze_many(iter(self.PAGES), use_pool=True) == expected
+
+    @pytest.mark.slow
+    def test_pool_uses_the_calling_extractor(self, force_pool):
+        results = _TaggingExtractor().analyze_many(self.PAGES, use_pool=True)
+        assert [p.url for p in results] == [url + "#tagged" for url, _ in self.PAGES]
+
+    def test_unpicklable_extractor_analysed_in_process(self, force_pool, monkeypatch):
+        class LocalExtractor(_TaggingExtractor):
+            pass
+
+        monkeypatch.setattr(intelligence, "ProcessPoolExecutor", None)
+        results = LocalExtractor().analyze_many(self.PAGES, use_pool=True)
+        assert [p.url for p in results] == [url + "#tagged" for url, _ in self.PAGES]
+
+    def test_env_var_disables_pool(self, extractor, force_pool, monkeypatch):
+        monkeypatch.setenv(intelligence._NO_POOL_ENV, "1")
+        monkeypatch.setattr(intelligence, "ProcessPoolExecutor", None)
+        assert len(extractor.analyze_many(self.PAGES, use_pool=True)) == len(self.PAGES)
+
+    @pytest.mark.parametrize(
+        ("value", "disabled"),
+        [("1", True), ("true", True), ("YES", True), ("0", False), ("false", False), ("", False)],
+    )
+    def test_env_var_parsed_as_boolean(self, monkeypatch, value, disabled):
+        monkeypatch.setenv(intelligence._NO_POOL_ENV, value)
+        assert intelligence._pool_disabled() is disabled
+
+    def test_falls_back_when_pool_unavailable(self, extractor, force_pool, monkeypatch):
+        def _no_pool(**_kwargs):
+            raise OSError("no semaphores")
+
+        monkeypatch.setattr(intelligence, "ProcessPoolExecutor", _no_pool)
+        expected = [extractor.analyze(url, text) for url, text in self.PAGES]
+        assert extractor.analyze_many(self.PAGES, use_pool=True) == expected
@@ -4,6 +4,7 @@ Tests for deepwebharvester.report — HTML report generation.
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -82,6 +83,39 @@ class TestReportGeneratorGenerate:
         content = path.read_text(encoding="utf-8")
         assert "<!DOCTYPE html>" in content
 
+    def test_graph_failure_does_not_abort_report(self, tmp_path):
+        gen = ReportGenerator()
+        with patch(
+            "deepwebharvester.report.GraphVisualizer.to_png_base64",
+            side_effect=ImportError("matplotlib missing"),
+        ):
+            path = gen.generate([_make_result()], output_dir=str(tmp_path))
+        html = path.read_text(encoding="utf-8")
+        assert "Executive Summary" in html
+        assert "3D Network Graph" not in html
+
+    def test_precomputed_intel_data_is_not_reanalysed(self, tmp_path):
+        gen = ReportGenerator()
+        result = _make_result(text="contact evil@bad.com")
+        intel = [gen._intel.analyze(result.url, result.text)]
+        with patch.object(gen._intel, "analyze_many") as mock_analyze:
+            path = gen.generate([result], output_dir=str(tmp_path), intel_data=intel)
+        mock_analyze.assert_not_called()
+        assert "evil@bad.com" in path.read_text(encoding="utf-8")
+
+    def test_analysis_does_not_use_pool_by_default(self, tmp_path):
+        gen = ReportGenerator()
+        result = _make_result()
+        intel = [gen._intel.analyze(result.url, result.text)]
+        with patch.object(gen._intel, "analyze_many", return_value=intel) as mock_analyze:
+            gen.generate([result], output_dir=str(tmp_path))
+        assert mock_analyze.call_args.kwargs == {"use_pool": False}
+
+    def test_intel_data_length_mismatch_raises(self, tmp_path):
+        gen = ReportGenerator()
+        with pytest.raises(ValueError, match="intel_data"):
+            gen.generate([_make_result()], output_dir=str(tmp_path), intel_data=[])
+
     def test_multiple_results(self, tmp_path):
         gen = ReportGenerator()
         results = [
@@ -6,12 +6,14 @@ and resume support via get_known_urls().
 """
 from __future__ import annotations
 
+import csv
 import json
 import sqlite3
 from pathlib import Path
 
 import pytest
 
+from deepwebharvester import storage
 from deepwebharvester.crawler import CrawlResult
 from deepwebharvester.storage import StorageManager
 from tests.conftest import VALID_ONION
@@ -78,6 +80,27 @@ class TestSQLite:
         count = tmp_storage.save_to_sqlite([result])
         assert count == 0
 
+    def test_duplicates_within_batch_counted_once(self, tmp_storage: StorageManager) -> None:
+        results = [make_result(), make_result(), make_result(url=VALID_ONION + "/other")]
+        count = tmp_storage.save_to_sqlite(results)
+        assert count == 2
+
+    def test_bad_row_does_not_drop_the_batch(
+        self, tmp_storage: StorageManager, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        good = [make_result(url=VALID_ONION + f"/ok{i}") for i in range(2)]
+        bad = make_result(url=VALID_ONION + "/bad", title=object())  # type: ignore[arg-type]
+        with caplog.at_level("ERROR", logger="deepwebharvester.storage"):
+            count = tmp_storage.save_to_sqlite([good[0], bad, good[1]])
+        assert count == 2
+        assert tmp_storage.get_known_urls() == {r.url for r in good}
+        assert bad.url in caplog.text
+
+    def test_wal_journal_mode_enabled(self, tmp_storage: StorageManager, tmp_path: Path) -> None:
+        with sqlite3.connect(tmp_path / "test.db") as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
     def test_get_known_urls_returns_saved(self, tmp_storage: StorageManager) -> None:
         result = make_result()
         tmp_storage.save_to_sqlite([result])
@@ -97,6 +120,20 @@ class TestSQLite:
         known = tmp_storage.get_known_urls()
         assert len(known) == 5
 
+    def test_connection_reused_across_calls(self, tmp_storage: StorageManager) -> None:
+        conn = tmp_storage._connect()
+        tmp_storage.save_to_sqlite([make_result()])
+        tmp_storage.get_known_urls()
+        assert tmp_storage._connect() is conn
+
+    def test_close_is_idempotent_and_reopens_on_demand(
+        self, tmp_storage: StorageManager
+    ) -> None:
+        tmp_storage.save_to_sqlite([make_result()])
+        tmp_storage.close()
+        tmp_storage.close()
+        assert tmp_storage.get_known_urls() == {make_result().url}
+
 
 # ── JSON ──────────────────────────────────────────────────────────────────────
 
@@ -137,6 +174,16 @@ class TestJSON:
         path = tmp_storage.save_to_json([make_result()], filename="custom.json")
         assert path.name == "custom.json"
 
+    def test_stdlib_fallback_matches_fast_encoder(
+        self, tmp_storage: StorageManager, monkeypatch
+    ) -> None:
+        results = [make_result(title="Éléphant \"quoted\"", text="multi\nline ✓")]
+        fast = tmp_storage.save_to_json(results, filename="fast.json").read_bytes()
+        monkeypatch.setattr(storage, "orjson", None)
+        slow = tmp_storage.save_to_json(results, filename="slow.json").read_bytes()
+        assert slow == fast
+        assert json.loads(slow)[0]["title"] == "Éléphant \"quoted\""
+
 
 # ── CSV ───────────────────────────────────────────────────────────────────────
 
@@ -169,6 +216,13 @@ class TestCSV:
         # Newlines in text field should be replaced with spaces
         assert "\nline two" not in content
 
+    def test_carriage_returns_stripped_from_text(self, tmp_storage: StorageManager) -> None:
+        result = make_result(text="one\r\ntwo\rthree")
+        path = tmp_storage.save_to_csv([result])
+        with open(path, newline="", encoding="utf-8") as fh:
+            rows = list(csv.reader(fh))
+        assert rows[1][-1] == "one  two three"
+
     def test_custom_filename(self, tmp_storage: StorageManager) -> None:
         path = tmp_storage.save_to_csv([make_result()], filename="output.csv")
         assert path.name == "output.csv"
@@ -1,46 +1,53 @@
 """
 Tests for TorManager.
 
-Uses mocks to avoid requiring a live Tor process during CI.
-Controller-related tests are skipped when stem's C extensions are
-unavailable (e.g. missing _cffi_backend in sandboxed environments).
+Uses mocks to avoid requiring a live Tor process during CI.  Circuit
+renewal tests use the ``fake_stem`` fixture, so they also run where
+stem's C extensions are unavailable (e.g. missing _cffi_backend).
 """
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import logging
+import sys
+from types import SimpleNamespace
+from typing import Callable, Optional
+from unittest.mock import MagicMock
 
 import pytest
 import requests
 
 from deepwebharvester.tor_manager import TorManager
 
-# stem.control requires the cryptography C extension (_cffi_backend).
-# Check for it without actually importing stem.control (which may panic).
-try:
-    import _cffi_backend as _  # noqa: F401
-    _STEM_AVAILABLE = True
-except ImportError:
-    _STEM_AVAILABLE = False
+# ── Helpers ───────────────────────────────────────────────────────────────────
 
-_skip_stem = pytest.mark.skipif(
-    not _STEM_AVAILABLE,
-    reason="stem.control unavailable (cryptography C extension not functional)",
-)
 
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skip the settle delay renew_circuit waits after NEWNYM."""
+    monkeypatch.setattr("deepwebharvester.tor_manager.time.sleep", lambda *_: None)
 
-# ── Fixtures ──────────────────────────────────────────────────────────────────
 
+def _fake_response(
+    payload: Optional[dict] = None, *, raise_exc: Optional[Exception] = None
+) -> SimpleNamespace:
+    """Minimal stand-in for the check endpoint's response."""
+    def _raise_for_status() -> None:
+        if raise_exc is not None:
+            raise raise_exc
 
-@pytest.fixture
-def manager() -> TorManager:
-    return TorManager(
-        socks_host="127.0.0.1",
-        socks_port=9050,
-        control_host="127.0.0.1",
-        control_port=9051,
-        control_password="test_password_123",
-        user_agent="DeepWebHarvester/2.0 (test)",
-    )
+    return SimpleNamespace(json=lambda: payload, raise_for_status=_raise_for_status)
+
+
+def _fake_session(
+    response: Optional[SimpleNamespace] = None, *, get_exc: Optional[Exception] = None
+) -> SimpleNamespace:
+    """Session stand-in whose ``get`` returns *response* or raises *get_exc*."""
+    def _get(url: str, **kwargs: object) -> Optional[SimpleNamespace]:
+        if get_exc is not None:
+            raise get_exc
+        return response
+
+    return SimpleNamespace(get=_get)
 
 
 # ── proxy_url ─────────────────────────────────────────────────────────────────
@@ -61,30 +68,30 @@ class TestProxyUrl:
 # ── create_session ────────────────────────────────────────────────────────────
 
 
-class TestCreateSession:
-    def test_returns_requests_session(self, manager: TorManager) -> None:
-        session = manager.create_session()
-        assert isinstance(session, requests.Session)
-
-    def test_http_proxy_set(self, manager: TorManager) -> None:
-        session = manager.create_session()
-        assert "http" in session.proxies
+@pytest.fixture(scope="class")
+def session(manager: TorManager) -> requests.Session:
+    """One session shared by checks that only inspect its configuration."""
+    return manager.create_session()
 
-    def test_https_proxy_set(self, manager: TorManager) -> None:
-        session = manager.create_session()
-        assert "https" in session.proxies
 
-    def test_proxies_use_socks5h(self, manager: TorManager) -> None:
-        session = manager.create_session()
-        assert "socks5h" in session.proxies["http"]
+_SESSION_CHECKS = [
+    pytest.param(lambda s: isinstance(s, requests.Session), id="requests-session"),
+    pytest.param(lambda s: "http" in s.proxies, id="http-proxy"),
+    pytest.param(lambda s: "https" in s.proxies, id="https-proxy"),
+    pytest.param(lambda s: "socks5h" in s.proxies["http"], id="socks5h-proxy"),
+    pytest.param(
+        lambda s: s.headers["User-Agent"] == "DeepWebHarvester/2.0 (test)", id="user-agent"
+    ),
+    pytest.param(lambda s: s.headers.get("DNT") == "1", id="dnt-header"),
+]
 
-    def test_user_agent_header(self, manager: TorManager) -> None:
-        session = manager.create_session()
-        assert session.headers["User-Agent"] == "DeepWebHarvester/2.0 (test)"
 
-    def test_dnt_header_present(self, manager: TorManager) -> None:
-        session = manager.create_session()
-        assert session.headers.get("DNT") == "1"
+class TestCreateSession:
+    @pytest.mark.parametrize("check", _SESSION_CHECKS)
+    def test_session_property(
+        self, session: requests.Session, check: Callable[[requests.Session], bool]
+    ) -> None:
+        assert check(session)
 
     def test_each_call_returns_new_session(self, manager: TorManager) -> None:
         s1 = manager.create_session()
@@ -100,62 +107,52 @@ class TestRenewCircuit:
         m = TorManager(control_password="")
         assert m.renew_circuit() is False
 
-    def test_no_password_does_not_invoke_stem(self) -> None:
+    def test_no_password_does_not_invoke_stem(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
         """When no password is set, stem should never be imported/called."""
+        # A None entry makes any "import stem" raise ImportError, which
+        # renew_circuit would log as an error.
+        monkeypatch.setitem(sys.modules, "stem", None)
         m = TorManager(control_password="")
-        result = m.renew_circuit()
-        assert result is False
+        assert m.renew_circuit() is False
+        assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
 
-    @_skip_stem
-    @patch("stem.control.Controller")
-    @patch("deepwebharvester.tor_manager.time.sleep", return_value=None)
     def test_successful_renewal_returns_true(
-        self, _sleep: MagicMock, mock_cls: MagicMock, manager: TorManager
+        self, manager: TorManager, fake_stem: MagicMock
     ) -> None:
         mock_ctrl = MagicMock()
-        mock_cls.from_port.return_value.__enter__.return_value = mock_ctrl
+        fake_stem.from_port.return_value.__enter__.return_value = mock_ctrl
         result = manager.renew_circuit()
         assert result is True
 
-    @_skip_stem
-    @patch("stem.control.Controller")
-    @patch("deepwebharvester.tor_manager.time.sleep", return_value=None)
-    def test_signal_newnym_sent(
-        self, _sleep: MagicMock, mock_cls: MagicMock, manager: TorManager
-    ) -> None:
-        import stem as _stem
+    def test_signal_newnym_sent(self, manager: TorManager, fake_stem: MagicMock) -> None:
         mock_ctrl = MagicMock()
-        mock_cls.from_port.return_value.__enter__.return_value = mock_ctrl
+        fake_stem.from_port.return_value.__enter__.return_value = mock_ctrl
         manager.renew_circuit()
-        mock_ctrl.signal.assert_called_once_with(_stem.Signal.NEWNYM)
+        mock_ctrl.signal.assert_called_once_with(sys.modules["stem"].Signal.NEWNYM)
 
-    @_skip_stem
-    @patch("stem.control.Controller")
-    @patch("deepwebharvester.tor_manager.time.sleep", return_value=None)
-    def test_authentication_called(
-        self, _sleep: MagicMock, mock_cls: MagicMock, manager: TorManager
-    ) -> None:
+    def test_authentication_called(self, manager: TorManager, fake_stem: MagicMock) -> None:
         mock_ctrl = MagicMock()
-        mock_cls.from_port.return_value.__enter__.return_value = mock_ctrl
+        fake_stem.from_port.return_value.__enter__.return_value = mock_ctrl
         manager.renew_circuit()
         mock_ctrl.authenticate.assert_called_once_with(password="test_password_123")
 
-    @_skip_stem
-    @patch("stem.control.Controller")
     def test_exception_returns_false(
-        self, mock_cls: MagicMock, manager: TorManager
+        self, manager: TorManager, fake_stem: MagicMock
     ) -> None:
-        mock_cls.from_port.side_effect = ConnectionRefusedError("Tor not running")
+        fake_stem.from_port.side_effect = ConnectionRefusedError("Tor not running")
         assert manager.renew_circuit() is False
 
-    @_skip_stem
-    @patch("stem.control.Controller")
-    @patch("deepwebharvester.tor_manager.time.sleep", return_value=None)
     def test_circuits_renewed_counter(
-        self, _sleep: MagicMock, mock_cls: MagicMock, manager: TorManager
+        self,
+        manager: TorManager,
+        monkeypatch: pytest.MonkeyPatch,
+        fake_stem: MagicMock,
     ) -> None:
+        monkeypatch.setattr(manager, "_circuits_renewed", 0)
         mock_ctrl = MagicMock()
-        mock_cls.from_port.return_value.__enter__.return_value = mock_ctrl
+        fake_stem.from_port.return_value.__enter__.return_value = mock_ctrl
         manager.renew_circuit()
         manager.renew_circuit()
         assert manager._circuits_renewed == 2
@@ -165,26 +162,35 @@ class TestRenewCircuit:
 
 
 class TestVerifyConnection:
-    def test_is_tor_returns_true(self, manager: TorManager) -> None:
-        mock_session = MagicMock()
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"IsTor": True, "IP": "1.2.3.4"}
-        mock_session.get.return_value = mock_response
-        manager.create_session = lambda: mock_session  # type: ignore
+    def test_is_tor_returns_true(
+        self, manager: TorManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        session = _fake_session(_fake_response({"IsTor": True, "IP": "1.2.3.4"}))
+        monkeypatch.setattr(manager, "create_session", lambda: session)
         assert manager.verify_connection() is True
 
-    def test_not_tor_returns_false(self, manager: TorManager) -> None:
-        mock_session = MagicMock()
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"IsTor": False, "IP": "1.2.3.4"}
-        mock_session.get.return_value = mock_response
-        manager.create_session = lambda: mock_session  # type: ignore
+    def test_not_tor_returns_false(
+        self, manager: TorManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        session = _fake_session(_fake_response({"IsTor": False, "IP": "1.2.3.4"}))
+        monkeypatch.setattr(manager, "create_session", lambda: session)
         assert manager.verify_connection() is False
 
-    def test_network_error_returns_false(self, manager: TorManager) -> None:
-        mock_session = MagicMock()
-        mock_session.get.side_effect = Exception("network error")
-        manager.create_session = lambda: mock_session  # type: ignore
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            pytest.param(requests.exceptions.Timeout("Request timed out"), id="timeout"),
+            pytest.param(
+                requests.exceptions.ConnectionError("Could not connect"), id="connection-error"
+            ),
+            pytest.param(Exception("network error"), id="network-error"),
+        ],
+    )
+    def test_request_failure_returns_false(
+        self, manager: TorManager, monkeypatch: pytest.MonkeyPatch, exc: Exception
+    ) -> None:
+        session = _fake_session(get_exc=exc)
+        monkeypatch.setattr(manager, "create_session", lambda: session)
         assert manager.verify_connection() is False
 
 
@@ -193,140 +199,76 @@ class TestVerifyConnection:
 
 class TestRenewCircuitEdgeCases:
     """
-    Additional tests for renew_circuit failure paths that are not covered
-    by the skip-stem guard.  These patch the lazy imports inside the module
-    so that stem is never actually required.
+    Additional tests for renew_circuit failure paths.  The ``fake_stem``
+    fixture stands in for the lazily imported stem modules, so stem is
+    never actually required.
     """
 
-    def test_connection_refused_returns_false(self, manager: TorManager) -> None:
+    def test_connection_refused_returns_false(
+        self, manager: TorManager, fake_stem: MagicMock
+    ) -> None:
         """Controller.from_port raising ConnectionRefusedError → False."""
-        mock_controller_cls = MagicMock()
-        mock_controller_cls.from_port.side_effect = ConnectionRefusedError(
-            "Connection refused"
-        )
-        mock_signal = MagicMock()
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "stem": MagicMock(Signal=mock_signal),
-                "stem.control": MagicMock(Controller=mock_controller_cls),
-            },
-        ):
-            # Re-run renew_circuit with the patched modules available
-            result = manager.renew_circuit()
-        assert result is False
+        fake_stem.from_port.side_effect = ConnectionRefusedError("Connection refused")
+        assert manager.renew_circuit() is False
 
-    def test_authentication_error_returns_false(self, manager: TorManager) -> None:
+    def test_authentication_error_returns_false(
+        self, manager: TorManager, fake_stem: MagicMock
+    ) -> None:
         """Controller.authenticate raising an exception → False."""
-        mock_ctrl = MagicMock()
-        mock_ctrl.authenticate.side_effect = Exception("Authentication failed")
-        mock_ctrl.__enter__ = lambda s: mock_ctrl
-        mock_ctrl.__exit__ = MagicMock(return_value=False)
-
-        mock_controller_cls = MagicMock()
-        mock_controller_cls.from_port.return_value = mock_ctrl
-        mock_signal = MagicMock()
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "stem": MagicMock(Signal=mock_signal),
-                "stem.control": MagicMock(Controller=mock_controller_cls),
-            },
-        ):
-            result = manager.renew_circuit()
-        assert result is False
+        ctrl = fake_stem.from_port.return_value.__enter__.return_value
+        ctrl.authenticate.side_effect = Exception("Authentication failed")
+        assert manager.renew_circuit() is False
 
-    def test_newnym_signal_failure_returns_false(self, manager: TorManager) -> None:
+    def test_newnym_signal_failure_returns_false(
+        self, manager: TorManager, fake_stem: MagicMock
+    ) -> None:
         """ctrl.signal(NEWNYM) raising an exception → False."""
-        mock_ctrl = MagicMock()
-        mock_ctrl.authenticate.return_value = None
-        mock_ctrl.signal.side_effect = Exception("NEWNYM failed")
-        mock_ctrl.__enter__ = lambda s: mock_ctrl
-        mock_ctrl.__exit__ = MagicMock(return_value=False)
-
-        mock_controller_cls = MagicMock()
-        mock_controller_cls.from_port.return_value = mock_ctrl
-        mock_signal = MagicMock()
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "stem": MagicMock(Signal=mock_signal),
-                "stem.control": MagicMock(Controller=mock_controller_cls),
-            },
-        ):
-            result = manager.renew_circuit()
-        assert result is False
+        ctrl = fake_stem.from_port.return_value.__enter__.return_value
+        ctrl.signal.side_effect = Exception("NEWNYM failed")
+        assert manager.renew_circuit() is False
 
     def test_circuits_renewed_not_incremented_on_failure(
-        self, manager: TorManager
+        self, manager: TorManager, monkeypatch: pytest.MonkeyPatch, fake_stem: MagicMock
     ) -> None:
         """Counter should stay at 0 when renewal fails."""
-        mock_controller_cls = MagicMock()
-        mock_controller_cls.from_port.side_effect = OSError("Tor not running")
-        mock_signal = MagicMock()
-
-        with patch.dict(
-            "sys.modules",
-            {
-                "stem": MagicMock(Signal=mock_signal),
-                "stem.control": MagicMock(Controller=mock_controller_cls),
-            },
-        ):
-            manager.renew_circuit()
+        monkeypatch.setattr(manager, "_circuits_renewed", 0)
+        fake_stem.from_port.side_effect = OSError("Tor not running")
+        manager.renew_circuit()
         assert manager._circuits_renewed == 0
 
 
 class TestVerifyConnectionEdgeCases:
     """Additional verify_connection edge cases."""
 
-    def test_timeout_exception_returns_false(self, manager: TorManager) -> None:
-        """A requests.Timeout during verify_connection → False."""
-        mock_session = MagicMock()
-        mock_session.get.side_effect = requests.exceptions.Timeout(
-            "Request timed out"
-        )
-        manager.create_session = lambda: mock_session  # type: ignore
-        assert manager.verify_connection() is False
-
-    def test_connection_error_returns_false(self, manager: TorManager) -> None:
-        """A requests.ConnectionError → False."""
-        mock_session = MagicMock()
-        mock_session.get.side_effect = requests.exceptions.ConnectionError(
-            "Could not connect"
-        )
-        manager.create_session = lambda: mock_session  # type: ignore
-        assert manager.verify_connection() is False
-
-    def test_http_error_status_returns_false(self, manager: TorManager) -> None:
+    def test_http_error_status_returns_false(
+        self, manager: TorManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """An HTTP error status (raise_for_status) → False."""
-        mock_session = MagicMock()
-        mock_response = MagicMock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
-            "503 Service Unavailable"
+        session = _fake_session(
+            _fake_response(raise_exc=requests.exceptions.HTTPError("503 Service Unavailable"))
         )
-        mock_session.get.return_value = mock_response
-        manager.create_session = lambda: mock_session  # type: ignore
+        monkeypatch.setattr(manager, "create_session", lambda: session)
         assert manager.verify_connection() is False
 
-    def test_missing_istor_key_treated_as_false(self, manager: TorManager) -> None:
+    def test_missing_istor_key_treated_as_false(
+        self, manager: TorManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """If the API response has no IsTor key, verify_connection should return False."""
-        mock_session = MagicMock()
-        mock_response = MagicMock()
         # IsTor key missing — dict.get defaults to False
-        mock_response.json.return_value = {"IP": "1.2.3.4"}
-        mock_session.get.return_value = mock_response
-        manager.create_session = lambda: mock_session  # type: ignore
+        session = _fake_session(_fake_response({"IP": "1.2.3.4"}))
+        monkeypatch.setattr(manager, "create_session", lambda: session)
         assert manager.verify_connection() is False
 
-    def test_istor_false_value_returns_false(self, manager: TorManager) -> None:
+    def test_istor_false_value_returns_false(
+        self,
+        manager: TorManager,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
         """Explicit IsTor=False in response → False (also checks non-Tor warning path)."""
-        mock_session = MagicMock()
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"IsTor": False, "IP": "203.0.113.1"}
-        mock_session.get.return_value = mock_response
-        manager.create_session = lambda: mock_session  # type: ignore
-        result = manager.verify_connection()
+        session = _fake_session(_fake_response({"IsTor": False, "IP": "203.0.113.1"}))
+        monkeypatch.setattr(manager, "create_session", lambda: session)
+        with caplog.at_level(logging.WARNING, logger="deepwebharvester.tor_manager"):
+            result = manager.verify_connection()
         assert result is False
+        assert "does NOT appear to be going through Tor" in caplog.text
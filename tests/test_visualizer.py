@@ -4,7 +4,10 @@ Tests for deepwebharvester.visualizer — 3D network graph rendering.
 from __future__ import annotations
 
 import base64
+import math
+import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -12,20 +15,21 @@ from deepwebharvester.crawler import CrawlResult
 from deepwebharvester.visualizer import GraphVisualizer, _RISK_COLORS, _RISK_ORDER
 
 # ---------------------------------------------------------------------------
-# Skip gracefully if matplotlib / networkx are not installed
+# Skip gracefully if matplotlib / networkx are missing or fail to import
 # ---------------------------------------------------------------------------
 
 try:
-    import matplotlib  # noqa: F401
-    import networkx    # noqa: F401
-    _VIZ_AVAILABLE = True
-except ImportError:
-    _VIZ_AVAILABLE = False
+    import networkx as nx
+    from matplotlib.figure import Figure
+    from mpl_toolkits.mplot3d import Axes3D
+except ImportError as exc:
+    pytest.skip(
+        f"matplotlib and networkx required for visualizer tests ({exc})",
+        allow_module_level=True,
+    )
 
-pytestmark = pytest.mark.skipif(
-    not _VIZ_AVAILABLE,
-    reason="matplotlib and networkx required for visualizer tests",
-)
+# Keep matplotlib's global state on one xdist worker (--dist=loadgroup)
+pytestmark = pytest.mark.xdist_group("viz")
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -55,6 +59,59 @@ def _result(
     )
 
 
+# Shared inputs; the visualizer only reads results, so tests can reuse them
+_R_A1 = _result(SITE_A + "/p1", SITE_A)
+_R_A2 = _result(SITE_A + "/p2", SITE_A, depth=1)
+_R_B1 = _result(SITE_B + "/p1", SITE_B)
+_SINGLE = [_R_A1]
+_MULTI = [_R_A1, _R_A2, _R_B1]
+
+
+@pytest.fixture(autouse=True)
+def _close_figs():
+    """Close any pyplot-managed figures a test leaves behind."""
+    yield
+    plt = sys.modules.get("matplotlib.pyplot")  # no import if never loaded
+    if plt is not None:
+        plt.close("all")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _few_layout_iterations():
+    """Cap spring_layout iterations; tests check layout shape, not quality."""
+    spring_layout = nx.spring_layout
+
+    def fast_spring_layout(G, *args, **kwargs):
+        kwargs["iterations"] = min(kwargs.get("iterations", 50), 5)
+        return spring_layout(G, *args, **kwargs)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(nx, "spring_layout", fast_spring_layout)
+        yield
+
+
+@pytest.fixture(scope="module")
+def viz_artifacts() -> SimpleNamespace:
+    """Graph, layout, figure and PNG for one canonical two-site crawl.
+
+    Rendering dominates this module's run time, so tests that only inspect
+    the output of the canonical input share a single build of each artifact.
+    """
+    viz = GraphVisualizer()
+    G = viz._build_graph(_MULTI, {})
+    # Low DPI: tests check the encoding, not the image detail
+    b64 = viz.to_png_base64(_MULTI, dpi=60)
+    return SimpleNamespace(
+        viz=viz,
+        results=_MULTI,
+        G=G,
+        pos=viz._compute_layout(G),
+        fig=viz.build_figure(_MULTI),
+        b64=b64,
+        png_bytes=base64.b64decode(b64, validate=True),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -77,65 +134,22 @@ class TestConstants:
 # GraphVisualizer._build_graph()
 # ---------------------------------------------------------------------------
 
-class TestBuildGraph:
-    def test_site_nodes_added(self):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        G = viz._build_graph(results, {})
-        assert SITE_A in G.nodes
-
-    def test_page_nodes_added(self):
-        viz = GraphVisualizer()
-        url = SITE_A + "/page1"
-        results = [_result(url, SITE_A)]
-        G = viz._build_graph(results, {})
-        assert url in G.nodes
+_GRAPH_CHECKS = [
+    pytest.param(lambda G: SITE_A in G.nodes, id="site-node"),
+    pytest.param(lambda G: SITE_B in G.nodes, id="second-site-node"),
+    pytest.param(lambda G: SITE_A + "/p1" in G.nodes, id="page-node"),
+    pytest.param(lambda G: G.has_edge(SITE_A, SITE_A + "/p1"), id="site-to-page-edge"),
+    pytest.param(lambda G: G.nodes[SITE_A]["kind"] == "site", id="site-kind"),
+    pytest.param(lambda G: G.nodes[SITE_A + "/p1"]["kind"] == "page", id="page-kind"),
+    pytest.param(lambda G: G.nodes[SITE_A]["page_count"] == 2, id="site-page-count"),
+    pytest.param(lambda G: G.nodes[SITE_A + "/p1"]["risk"] == "unknown", id="no-intel-risk"),
+]
 
-    def test_edge_from_site_to_page(self):
-        viz = GraphVisualizer()
-        url = SITE_A + "/page1"
-        results = [_result(url, SITE_A)]
-        G = viz._build_graph(results, {})
-        assert G.has_edge(SITE_A, url)
 
-    def test_site_kind_attribute(self):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/", SITE_A)]
-        G = viz._build_graph(results, {})
-        assert G.nodes[SITE_A]["kind"] == "site"
-
-    def test_page_kind_attribute(self):
-        viz = GraphVisualizer()
-        url = SITE_A + "/p"
-        results = [_result(url, SITE_A)]
-        G = viz._build_graph(results, {})
-        assert G.nodes[url]["kind"] == "page"
-
-    def test_multiple_sites(self):
-        viz = GraphVisualizer()
-        results = [
-            _result(SITE_A + "/p1", SITE_A),
-            _result(SITE_B + "/p1", SITE_B),
-        ]
-        G = viz._build_graph(results, {})
-        assert SITE_A in G.nodes
-        assert SITE_B in G.nodes
-
-    def test_site_page_count_stored(self):
-        viz = GraphVisualizer()
-        results = [
-            _result(SITE_A + "/p1", SITE_A),
-            _result(SITE_A + "/p2", SITE_A),
-        ]
-        G = viz._build_graph(results, {})
-        assert G.nodes[SITE_A]["page_count"] == 2
-
-    def test_no_intel_risk_is_unknown(self):
-        viz = GraphVisualizer()
-        url = SITE_A + "/p"
-        results = [_result(url, SITE_A)]
-        G = viz._build_graph(results, {})
-        assert G.nodes[url]["risk"] == "unknown"
+class TestBuildGraph:
+    @pytest.mark.parametrize("check", _GRAPH_CHECKS)
+    def test_graph_property(self, viz_artifacts, check):
+        assert check(viz_artifacts.G)
 
     def test_empty_results(self):
         viz = GraphVisualizer()
@@ -149,14 +163,12 @@ class TestBuildGraph:
 
 class TestComputeLayout:
     def test_empty_graph_returns_empty(self):
-        import networkx as nx
         viz = GraphVisualizer()
         G = nx.DiGraph()
         pos = viz._compute_layout(G)
         assert pos == {}
 
     def test_single_node(self):
-        import networkx as nx
         viz = GraphVisualizer()
         G = nx.DiGraph()
         G.add_node("only")
@@ -164,30 +176,16 @@ class TestComputeLayout:
         assert "only" in pos
         assert len(pos["only"]) == 3
 
-    def test_all_nodes_have_3d_positions(self):
-        import networkx as nx
-        viz = GraphVisualizer()
-        results = [
-            _result(SITE_A + "/p1", SITE_A),
-            _result(SITE_A + "/p2", SITE_A),
-            _result(SITE_B + "/p1", SITE_B),
-        ]
-        G = viz._build_graph(results, {})
-        pos = viz._compute_layout(G)
-        for node in G.nodes:
+    def test_all_nodes_have_3d_positions(self, viz_artifacts):
+        pos = viz_artifacts.pos
+        for node in viz_artifacts.G.nodes:
             assert node in pos
             xyz = pos[node]
             assert len(xyz) == 3
             assert all(isinstance(v, float) for v in xyz)
 
-    def test_positions_are_finite(self):
-        import math
-        import networkx as nx
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + f"/p{i}", SITE_A) for i in range(5)]
-        G = viz._build_graph(results, {})
-        pos = viz._compute_layout(G)
-        for node, xyz in pos.items():
+    def test_positions_are_finite(self, viz_artifacts):
+        for node, xyz in viz_artifacts.pos.items():
             for v in xyz:
                 assert math.isfinite(v), f"Non-finite position for {node}: {xyz}"
 
@@ -197,49 +195,31 @@ class TestComputeLayout:
 # ---------------------------------------------------------------------------
 
 class TestBuildFigure:
-    def test_returns_figure_object(self):
-        from matplotlib.figure import Figure
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        fig = viz.build_figure(results)
-        assert isinstance(fig, Figure)
+    def test_returns_figure_object(self, viz_artifacts):
+        assert isinstance(viz_artifacts.fig, Figure)
 
-    def test_figure_has_3d_axes(self):
-        from mpl_toolkits.mplot3d import Axes3D
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        fig = viz.build_figure(results)
-        ax = fig.axes[0]
+    def test_figure_has_3d_axes(self, viz_artifacts):
+        ax = viz_artifacts.fig.axes[0]
         assert isinstance(ax, Axes3D)
 
     def test_empty_results(self):
-        from matplotlib.figure import Figure
         viz = GraphVisualizer()
         fig = viz.build_figure([])
         assert isinstance(fig, Figure)
 
-    def test_multiple_sites_and_pages(self):
-        from matplotlib.figure import Figure
-        viz = GraphVisualizer()
-        results = [
-            _result(SITE_A + "/p1", SITE_A, depth=0),
-            _result(SITE_A + "/p2", SITE_A, depth=1),
-            _result(SITE_B + "/p1", SITE_B, depth=0),
-        ]
-        fig = viz.build_figure(results)
-        assert isinstance(fig, Figure)
+    def test_multiple_sites_and_pages(self, viz_artifacts):
+        title = viz_artifacts.fig.axes[0].get_title()
+        assert "3 page(s)" in title
+        assert "2 site(s)" in title
 
     def test_light_theme(self):
-        from matplotlib.figure import Figure
         viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        fig = viz.build_figure(results, dark=False)
+        fig = viz.build_figure(_SINGLE, dark=False)
         assert isinstance(fig, Figure)
 
     def test_custom_figsize(self):
         viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        fig = viz.build_figure(results, figsize=(8, 6))
+        fig = viz.build_figure(_SINGLE, figsize=(8, 6))
         w, h = fig.get_size_inches()
         assert (w, h) == (8.0, 6.0)
 
@@ -249,24 +229,18 @@ class TestBuildFigure:
 # ---------------------------------------------------------------------------
 
 class TestToPngBase64:
-    def test_returns_string(self):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        b64 = viz.to_png_base64(results)
+    def test_returns_string(self, viz_artifacts):
+        b64 = viz_artifacts.b64
         assert isinstance(b64, str)
         assert len(b64) > 0
 
-    def test_valid_base64(self):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        b64 = viz.to_png_base64(results)
-        # Should decode without error
-        data = base64.b64decode(b64)
-        assert data[:8] == b"\x89PNG\r\n\x1a\n"  # PNG magic bytes
+    def test_valid_base64(self, viz_artifacts):
+        # Strict decoding already succeeded in the fixture
+        assert viz_artifacts.png_bytes[:8] == b"\x89PNG\r\n\x1a\n"  # PNG magic bytes
 
     def test_empty_results(self):
         viz = GraphVisualizer()
-        b64 = viz.to_png_base64([])
+        b64 = viz.to_png_base64([], dpi=60)
         assert isinstance(b64, str)
         assert len(b64) > 0
 
@@ -275,38 +249,34 @@ class TestToPngBase64:
 # GraphVisualizer.save_png()
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="class")
+def saved_png(tmp_path_factory) -> Path:
+    """One save_png run shared by the tests that only inspect its output."""
+    out = tmp_path_factory.mktemp("viz") / "graph.png"
+    viz = GraphVisualizer()
+    return viz.save_png(_SINGLE, output_path=str(out), dpi=60)
+
+
 class TestSavePng:
-    def test_creates_file(self, tmp_path):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        out = tmp_path / "graph.png"
-        path = viz.save_png(results, output_path=str(out))
-        assert path.exists()
+    def test_creates_file(self, saved_png):
+        assert saved_png.exists()
 
-    def test_returns_path_object(self, tmp_path):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        path = viz.save_png(results, output_path=str(tmp_path / "g.png"))
-        assert isinstance(path, Path)
+    def test_returns_path_object(self, saved_png):
+        assert isinstance(saved_png, Path)
 
     def test_creates_parent_dirs(self, tmp_path):
         viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
         deep = tmp_path / "a" / "b" / "c" / "graph.png"
-        viz.save_png(results, output_path=str(deep))
+        viz.save_png(_SINGLE, output_path=str(deep), dpi=60)
         assert deep.exists()
 
-    def test_png_magic_bytes(self, tmp_path):
-        viz = GraphVisualizer()
-        results = [_result(SITE_A + "/p1", SITE_A)]
-        out = tmp_path / "graph.png"
-        viz.save_png(results, output_path=str(out))
-        with open(out, "rb") as f:
+    def test_png_magic_bytes(self, saved_png):
+        with open(saved_png, "rb") as f:
             header = f.read(8)
         assert header == b"\x89PNG\r\n\x1a\n"
 
     def test_empty_results_still_saves(self, tmp_path):
         viz = GraphVisualizer()
         out = tmp_path / "empty.png"
-        viz.save_png([], output_path=str(out))
+        viz.save_png([], output_path=str(out), dpi=60)
         assert out.exists()